@@ -2,7 +2,8 @@ from typing import Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from datetime import datetime, timezone
 
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_user, get_current_user_strict
+from app.services.session_cache import to_utc
 from app.models.consent import (
     PrivacyConsentResponse,
     UpdatePrivacyConsentRequest,
@@ -67,7 +68,7 @@ def get_privacy_consent(
         if not doc.exists:
             # Return defaults if no record exists
             print(f"[PRIVACY] No privacy record found for user {uid}, returning defaults")
-            return PrivacyConsentResponse(
+            return PrivacyConsentResponse.model_construct(
                 uid=uid,
                 listeningEnabled=False,
                 dataAnalysisEnabled=False,
@@ -79,29 +80,13 @@ def get_privacy_consent(
         privacy_data = doc.to_dict()
         
         # Convert timestamps
-        consent_given_at = privacy_data.get('consentGivenAt')
-        if consent_given_at:
-            if hasattr(consent_given_at, 'timestamp'):
-                consent_given_at = datetime.fromtimestamp(consent_given_at.timestamp(), tz=timezone.utc)
-            elif isinstance(consent_given_at, datetime):
-                if consent_given_at.tzinfo is None:
-                    consent_given_at = consent_given_at.replace(tzinfo=timezone.utc)
-        else:
-            consent_given_at = None
-        
-        last_updated_at = privacy_data.get('lastUpdatedAt')
-        if last_updated_at:
-            if hasattr(last_updated_at, 'timestamp'):
-                last_updated_at = datetime.fromtimestamp(last_updated_at.timestamp(), tz=timezone.utc)
-            elif isinstance(last_updated_at, datetime):
-                if last_updated_at.tzinfo is None:
-                    last_updated_at = last_updated_at.replace(tzinfo=timezone.utc)
-        else:
-            last_updated_at = None
+        consent_given_at = to_utc(privacy_data.get('consentGivenAt'))
+        
+        last_updated_at = to_utc(privacy_data.get('lastUpdatedAt'))
         
         print(f"[PRIVACY] Retrieved privacy preferences for user {uid}")
         
-        return PrivacyConsentResponse(
+        return PrivacyConsentResponse.model_construct(
             uid=uid,
             listeningEnabled=privacy_data.get('listeningEnabled', False),
             dataAnalysisEnabled=privacy_data.get('dataAnalysisEnabled', False),
@@ -136,7 +121,7 @@ def get_privacy_consent(
 )
 def update_privacy_consent(
     request: UpdatePrivacyConsentRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user_strict)
 ) -> PrivacyConsentResponse:
     """Update the current user's privacy and consent preferences.
     
@@ -189,29 +174,13 @@ def update_privacy_consent(
         updated_data = updated_doc.to_dict()
         
         # Convert timestamps
-        consent_given_at = updated_data.get('consentGivenAt')
-        if consent_given_at:
-            if hasattr(consent_given_at, 'timestamp'):
-                consent_given_at = datetime.fromtimestamp(consent_given_at.timestamp(), tz=timezone.utc)
-            elif isinstance(consent_given_at, datetime):
-                if consent_given_at.tzinfo is None:
-                    consent_given_at = consent_given_at.replace(tzinfo=timezone.utc)
-        else:
-            consent_given_at = None
-        
-        last_updated_at = updated_data.get('lastUpdatedAt')
-        if last_updated_at:
-            if hasattr(last_updated_at, 'timestamp'):
-                last_updated_at = datetime.fromtimestamp(last_updated_at.timestamp(), tz=timezone.utc)
-            elif isinstance(last_updated_at, datetime):
-                if last_updated_at.tzinfo is None:
-                    last_updated_at = last_updated_at.replace(tzinfo=timezone.utc)
-        else:
-            last_updated_at = None
+        consent_given_at = to_utc(updated_data.get('consentGivenAt'))
+        
+        last_updated_at = to_utc(updated_data.get('lastUpdatedAt'))
         
         print(f"[PRIVACY] Updated privacy preferences for user {uid}")
         
-        return PrivacyConsentResponse(
+        return PrivacyConsentResponse.model_construct(
             uid=uid,
             listeningEnabled=updated_data.get('listeningEnabled', False),
             dataAnalysisEnabled=updated_data.get('dataAnalysisEnabled', False),
@@ -1,11 +1,17 @@
-from typing import Dict, Any, List, Literal
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Dict, Any, List, Literal, Union
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from datetime import datetime, timezone, timedelta
 from collections import defaultdict
 
 from app.auth.dependencies import get_current_user
 from app.models.report import WeeklyReportResponse, MonthlyReportResponse
-from app.models.progress import ProgressReportResponse, ChartDataResponse, ChartDataPoint, CategoryDistribution
+from app.models.progress import (
+    ProgressReportResponse,
+    ChartDataResponse,
+    ChartDataColumnarResponse,
+    ChartDataPoint,
+    CategoryDistribution,
+)
 from firebase_admin import firestore
 
 router = APIRouter(
@@ -535,9 +541,11 @@ def get_progress_report(
 
 @router.get(
     "/chart/{period}",
-    response_model=ChartDataResponse,
+    response_model=Union[ChartDataResponse, ChartDataColumnarResponse],
     summary="Get chart data",
-    description="Returns time series data points for chart visualization for a specific time period.",
+    description="Returns time series data points for chart visualization for a specific time period. "
+                "With layout=columns the points are returned as parallel timestamps/minutes arrays, "
+                "with timestamps as Unix epoch seconds.",
     responses={
         200: {
             "description": "Chart data retrieved successfully",
@@ -552,8 +560,9 @@ def get_progress_report(
 )
 def get_chart_data(
     period: Literal["today", "week", "month", "lifetime"],
+    layout: Literal["rows", "columns"] = "rows",
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> ChartDataResponse:
+) -> Response:
     """Get chart data for a specific time period.
     
     Groups sessions by time resolution:
@@ -564,10 +573,12 @@ def get_chart_data(
     
     Args:
         period: The time period to aggregate (today, week, month, lifetime)
+        layout: "rows" (a list of points) or "columns" (parallel arrays with epoch-second
+            timestamps, smaller payload)
         current_user: The authenticated user object (injected via dependency)
         
     Returns:
-        ChartDataResponse: Time series data points for the chart
+        ChartDataResponse (or ChartDataColumnarResponse): Time series data points for the chart
     """
     try:
         uid = current_user["uid"]
@@ -724,10 +735,17 @@ def get_chart_data(
         
         print(f"[REPORTS] Chart data for {period} period: {len(points)} data points")
         
-        return ChartDataResponse(
-            period=period,
-            points=points,
-        )
+        if layout == "columns":
+            chart = ChartDataColumnarResponse(
+                period=period,
+                timestamps=[int(point.timestamp.timestamp()) for point in points],
+                minutes=[point.minutes for point in points],
+            )
+        else:
+            chart = ChartDataResponse(period=period, points=points)
+        
+        # Serialized in one pydantic-core pass (skips FastAPI's response_model re-validation)
+        return Response(content=chart.model_dump_json(), media_type="application/json")
         
     except HTTPException:
         raise
@@ -1,6 +1,7 @@
 from typing import Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Body
 from datetime import datetime, timezone
+from pydantic import TypeAdapter
 import uuid
 
 from app.auth.dependencies import get_current_user
@@ -16,6 +17,7 @@ from app.models.session import (
     SessionDetailResponse,
     UpdateNoteRequest,
 )
+from app.services.session_cache import invalidate_user_sessions, started_bucket_fields
 from firebase_admin import firestore
 
 router = APIRouter(
@@ -23,6 +25,9 @@ router = APIRouter(
     tags=["sessions"],
 )
 
+# Built once: serializes the session list straight to JSON bytes
+_SESSIONS_ADAPTER = TypeAdapter(list[SessionSummary])
+
 
 def get_firestore_db():
     """Get Firestore database instance."""
@@ -173,6 +178,7 @@ def start_session(
         session_data = {
             'uid': uid,
             'startedAt': started_at,
+            **started_bucket_fields(started_at),
             'endedAt': None,
             'status': 'ACTIVE',
             'device': request.device,
@@ -326,6 +332,8 @@ def stop_session(
             'endedAt': ended_at,
             'status': 'STOPPED',
             'totals': updated_totals,
+            # Backfills the stats buckets for sessions started before they existed
+            **started_bucket_fields(started_at_dt),
         }
         
         # Add recording timestamps if provided
@@ -336,6 +344,7 @@ def stop_session(
                 update_data['recordingEndedAt'] = request.recordingEndedAt
         
         doc_ref.update(update_data)
+        invalidate_user_sessions(uid)
         
         # Get updated session data
         updated_doc = doc_ref.get()
@@ -494,7 +503,7 @@ def get_last_session(
 )
 def list_sessions(
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> SessionsListResponse:
+) -> Response:
     """Get all listening sessions for the current user.
     
     Returns sessions sorted by startedAt in descending order (latest first).
@@ -584,7 +593,12 @@ def list_sessions(
             sessions_list.append(session_summary)
         
         print(f"[SESSIONS] Retrieved {len(sessions_list)} sessions for user {uid}")
-        return SessionsListResponse(sessions=sessions_list)
+        # SessionsListResponse body, serialized by the prebuilt adapter (skips
+        # building the wrapper model and FastAPI's response_model re-validation)
+        return Response(
+            content=b'{"sessions":' + _SESSIONS_ADAPTER.dump_json(sessions_list) + b'}',
+            media_type="application/json",
+        )
         
     except Exception as e:
         import traceback
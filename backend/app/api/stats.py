@@ -1,19 +1,54 @@
-from typing import Dict, Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
-from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+from typing import Dict, Any, List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from datetime import date, datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from array import array
+import logging
+import numpy as np
 
 from app.auth.dependencies import get_current_user
 from app.models.weekly_stats import WeeklyStatsResponse, DailyTotal, WeeklyCategoryDistribution
 from app.models.monthly_stats import MonthlyStatsResponse, PerDayTotal, MonthlyCategoryDistribution, MonthlyComparisonResponse
-from app.models.lifetime_stats import LifetimeStatsResponse, MonthlyAverage, LifetimeCategoryDistribution
+from app.models.lifetime_stats import (
+    LifetimeStatsResponse,
+    LifetimeStatsColumnarResponse,
+    MonthlyAverage,
+    MonthlyAveragesColumnar,
+    LifetimeCategoryDistribution,
+)
+from app.models.combined_stats import CombinedStatsResponse
+from app.services.stats_kernels import reduce_categories
+from app.services.session_cache import (
+    EPOCH_DAY_ORDINAL,
+    STATS_EPOCH,
+    ParsedSession,
+    get_stopped_sessions,
+    get_cached_stats_response,
+    cache_stats_response,
+    to_utc,
+)
 from firebase_admin import firestore
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/stats",
     tags=["stats"],
 )
 
+# Runs the user-profile read while the session scan happens on the request thread
+_stats_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="stats")
+
+MONTH_NAMES = ("", "January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December")
+
+
+@lru_cache(maxsize=1024)
+def _format_month(year: int, month: int) -> str:
+    """Month label like 'January 2024', shared across requests and users."""
+    return f"{MONTH_NAMES[month]} {year}"
+
 
 def get_firestore_db():
     """Get Firestore database instance."""
@@ -33,6 +68,351 @@ def get_week_start_end():
     return week_start, week_end
 
 
+def get_month_start_end(year: int, month: int):
+    """Get the start and end of a specific month."""
+    from calendar import monthrange
+    month_start = datetime(year, month, 1, 0, 0, 0, 0, tzinfo=timezone.utc)
+    last_day = monthrange(year, month)[1]
+    month_end = datetime(year, month, last_day, 23, 59, 59, 999999, tzinfo=timezone.utc)
+    return month_start, month_end
+
+
+class _WindowAccumulator:
+    """Running totals for the STOPPED sessions that started inside [start, end]."""
+    __slots__ = (
+        "start", "end", "start_ts", "end_ts", "base_day", "total_sessions", "total_seconds",
+        "minutes_per_day", "sessions_per_day", "category_totals",
+    )
+
+    def __init__(self, start: datetime, end: datetime):
+        self.start = start
+        self.end = end
+        # Window bounds as epoch seconds, computed once per request
+        self.start_ts = start.timestamp()
+        self.end_ts = end.timestamp()
+        self.total_sessions = 0
+        self.total_seconds = 0
+        # Daily totals as dense buffers indexed by (epoch day - base_day)
+        self.base_day = start.toordinal() - EPOCH_DAY_ORDINAL
+        num_days = end.toordinal() - start.toordinal() + 1
+        self.minutes_per_day = array('d', [0.0]) * num_days
+        self.sessions_per_day = array('l', [0]) * num_days
+        self.category_totals = {
+            "gossip": 0.0,
+            "unethical": 0.0,
+            "waste": 0.0,
+            "productive": 0.0,
+        }
+
+    def in_range(self, started_at_ts: float) -> bool:
+        return self.start_ts <= started_at_ts <= self.end_ts
+
+
+def _accumulate(session: ParsedSession, accumulators: List[_WindowAccumulator]) -> None:
+    """Add one session to every accumulator whose window contains it.
+
+    The per-session work (minutes, classification scores) is done once and
+    shared by all accumulators; the day bucket is the stored startedDay.
+    """
+    started_at_ts = session.started_at_ts
+    total_seconds = session.total_seconds
+    total_minutes = total_seconds / 60.0
+    gossip_score, unethical_score, waste_score, productive_score = session.classification
+    started_day = session.started_day
+
+    for acc in accumulators:
+        if not acc.in_range(started_at_ts):
+            continue
+
+        acc.total_sessions += 1
+        acc.total_seconds += total_seconds
+        day_idx = started_day - acc.base_day
+        acc.minutes_per_day[day_idx] += total_minutes
+        acc.sessions_per_day[day_idx] += 1
+
+        # Category scores weighted by session duration in minutes
+        # (all zeros when the session has not been analyzed yet)
+        acc.category_totals["gossip"] += gossip_score * total_minutes
+        acc.category_totals["unethical"] += unethical_score * total_minutes
+        acc.category_totals["waste"] += waste_score * total_minutes
+        acc.category_totals["productive"] += productive_score * total_minutes
+
+
+def _category_percentages(category_totals: Dict[str, float]) -> Dict[str, float]:
+    """Convert weighted category totals into percentages (all zeros when empty)."""
+    totals = np.fromiter(category_totals.values(), dtype=np.float64, count=len(category_totals))
+    total_category = totals.sum()
+    if total_category <= 0:
+        return {"gossip": 0.0, "unethical": 0.0, "waste": 0.0, "productive": 0.0}
+    # Quantize all four percentages in one call
+    percentages = np.round(totals / total_category * 100, 1).tolist()
+    return dict(zip(category_totals.keys(), percentages))
+
+
+def _per_day_totals(acc: _WindowAccumulator, model_cls):
+    """Daily totals for every day of the accumulator's window, including empty days.
+
+    Args:
+        acc: Window accumulator
+        model_cls: Row model to build (DailyTotal or PerDayTotal)
+    """
+    # Round the whole window at once instead of per row
+    minutes = np.round(np.frombuffer(acc.minutes_per_day, dtype=np.float64), 1).tolist()
+    base_ordinal = acc.base_day + EPOCH_DAY_ORDINAL
+    return [
+        model_cls(
+            date=date.fromordinal(base_ordinal + i).isoformat(),  # YYYY-MM-DD
+            minutes=day_minutes,
+            sessions=day_sessions,
+        )
+        for i, (day_minutes, day_sessions) in enumerate(zip(minutes, acc.sessions_per_day))
+    ]
+
+
+def _build_weekly_response(uid: str, acc: _WindowAccumulator) -> WeeklyStatsResponse:
+    """Build the weekly stats response from a week accumulator."""
+    total_listening_minutes_week = acc.total_seconds / 60.0
+    daily_totals: List[DailyTotal] = _per_day_totals(acc, DailyTotal)
+    category_distribution = WeeklyCategoryDistribution(**_category_percentages(acc.category_totals))
+    category_totals = acc.category_totals
+
+    logger.info(
+        "[STATS] Weekly stats for user %s: %d sessions, %.2f minutes",
+        uid, acc.total_sessions, total_listening_minutes_week,
+        extra={"uid": uid, "sessions": acc.total_sessions, "minutes": total_listening_minutes_week},
+    )
+    logger.debug(
+        "[STATS] Category totals: gossip=%.2f, unethical=%.2f, waste=%.2f, productive=%.2f",
+        category_totals['gossip'], category_totals['unethical'], category_totals['waste'], category_totals['productive'],
+    )
+
+    return WeeklyStatsResponse(
+        total_sessions_week=acc.total_sessions,
+        total_listening_minutes_week=round(total_listening_minutes_week, 1),
+        daily_totals=daily_totals,
+        weekly_category_distribution=category_distribution,
+        week_start=acc.start,
+        week_end=acc.end,
+    )
+
+
+def _build_monthly_response(uid: str, acc: _WindowAccumulator, year: int, month: int) -> MonthlyStatsResponse:
+    """Build the monthly stats response from a month accumulator."""
+    total_listening_minutes_month = acc.total_seconds / 60.0
+    per_day_totals: List[PerDayTotal] = _per_day_totals(acc, PerDayTotal)
+    category_distribution = MonthlyCategoryDistribution(**_category_percentages(acc.category_totals))
+    category_totals = acc.category_totals
+
+    # Format month name
+    month_name = _format_month(year, month)
+
+    logger.info(
+        "[STATS] Monthly stats for user %s, %s: %d sessions, %.2f minutes",
+        uid, month_name, acc.total_sessions, total_listening_minutes_month,
+        extra={"uid": uid, "sessions": acc.total_sessions, "minutes": total_listening_minutes_month},
+    )
+    logger.debug(
+        "[STATS] Category totals: gossip=%.2f, unethical=%.2f, waste=%.2f, productive=%.2f",
+        category_totals['gossip'], category_totals['unethical'], category_totals['waste'], category_totals['productive'],
+    )
+
+    return MonthlyStatsResponse(
+        total_sessions_month=acc.total_sessions,
+        total_listening_minutes_month=round(total_listening_minutes_month, 1),
+        per_day_totals=per_day_totals,
+        month_category_distribution=category_distribution,
+        month_start=acc.start,
+        month_end=acc.end,
+        month_name=month_name,
+    )
+
+
+def _resolve_month(year: Optional[int], month: Optional[int]):
+    """Default year/month to the current month and validate the month."""
+    now = datetime.now(timezone.utc)
+    target_year = year if year is not None else now.year
+    target_month = month if month is not None else now.month
+
+    # Validate month
+    if target_month < 1 or target_month > 12:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid month. Must be between 1 and 12."
+        )
+    return target_year, target_month
+
+
+def _get_account_created_at(uid: str) -> datetime:
+    """Read the user's account creation date from their profile.
+
+    Raises:
+        HTTPException: 404 if the user profile does not exist
+    """
+    db = get_firestore_db()
+    user_doc = db.collection('users').document(uid).get()
+    if not user_doc.exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User profile not found"
+        )
+
+    user_data = user_doc.to_dict()
+    account_created_at = user_data.get('createdAt')
+    if account_created_at:
+        account_created_at = to_utc(account_created_at) or account_created_at
+    else:
+        # Fallback to a reasonable default (1 year ago)
+        account_created_at = datetime.now(timezone.utc) - timedelta(days=365)
+    return account_created_at
+
+
+def _fetch_lifetime_inputs(uid: str):
+    """Fetch the account creation date and all STOPPED sessions concurrently.
+
+    The profile read and the session scan are independent, so they overlap
+    instead of paying two Firestore round-trips back to back.
+
+    Returns:
+        Tuple of (account_created_at, sessions)
+
+    Raises:
+        HTTPException: 404 if the user profile does not exist
+    """
+    created_at_future = _stats_executor.submit(_get_account_created_at, uid)
+    # No upper bound: an open-ended entry also serves the weekly/monthly windows
+    sessions = get_stopped_sessions(uid, since=STATS_EPOCH)
+    account_created_at = created_at_future.result()
+    return account_created_at, sessions
+
+
+def _build_lifetime_response(
+    uid: str,
+    sessions: List[ParsedSession],
+    account_created_at: datetime,
+    columnar: bool = False,
+) -> LifetimeStatsResponse:
+    """Build the lifetime stats response from all of the user's STOPPED sessions.
+
+    With columnar=True the monthly average series is returned as parallel
+    arrays (LifetimeStatsColumnarResponse) instead of one object per month.
+    """
+    # Columnar aggregation: one NumPy pass instead of per-session dict updates
+    total_sessions = len(sessions)
+    first_session_date = None
+    active_days = 0
+    series = MonthlyAveragesColumnar(
+        years=[], months=[], month_names=[],
+        average_minutes_per_day=[], total_sessions=[], total_minutes=[],
+    )
+
+    category_totals = {
+        "gossip": 0.0,
+        "unethical": 0.0,
+        "waste": 0.0,
+        "productive": 0.0,
+    }
+    total_listening_seconds = 0.0
+
+    if total_sessions > 0:
+        started_days = np.fromiter((s.started_day for s in sessions), dtype=np.int64, count=total_sessions)
+        seconds = np.fromiter((s.total_seconds for s in sessions), dtype=np.float64, count=total_sessions)
+        minutes = seconds / 60.0
+        # One contiguous row per category: gossip, unethical, waste, productive
+        scores = np.ascontiguousarray(np.array([s.classification for s in sessions], dtype=np.float64).T)
+
+        total_listening_seconds = float(seconds.sum())
+        first_session_date = min(s.started_at_dt for s in sessions)
+
+        # Category scores weighted by session duration in minutes
+        gossip_total, unethical_total, waste_total, productive_total = reduce_categories(
+            scores[0], scores[1], scores[2], scores[3], minutes
+        )
+        category_totals["gossip"] = gossip_total
+        category_totals["unethical"] = unethical_total
+        category_totals["waste"] = waste_total
+        category_totals["productive"] = productive_total
+
+        # Per-day minutes and session counts, indexed by day offset
+        base_day = int(started_days.min())
+        day_offsets = started_days - base_day
+        minutes_per_day = np.bincount(day_offsets, weights=minutes)
+        sessions_per_day = np.bincount(day_offsets)
+
+        # Roll active days up into months (months since 1970-01). Each active
+        # day is counted once, so the per-month day count is distinct days.
+        active_offsets = np.flatnonzero(sessions_per_day)
+        active_days = len(active_offsets)
+        active_months = (active_offsets + base_day).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+        months, month_pos = np.unique(active_months, return_inverse=True)
+        month_minutes = np.bincount(month_pos, weights=minutes_per_day[active_offsets])
+        month_sessions = np.bincount(month_pos, weights=sessions_per_day[active_offsets])
+        month_days = np.bincount(month_pos)
+
+        # Generate monthly average series (np.unique returns months sorted
+        # chronologically). Every month here has at least one active day.
+        years = (months // 12 + 1970).tolist()
+        month_numbers = (months % 12 + 1).tolist()
+        series = MonthlyAveragesColumnar.model_construct(
+            years=years,
+            months=month_numbers,
+            month_names=[_format_month(year, month) for year, month in zip(years, month_numbers)],
+            average_minutes_per_day=np.round(month_minutes / month_days, 1).tolist(),
+            total_sessions=month_sessions.astype(np.int64).tolist(),
+            total_minutes=np.round(month_minutes, 1).tolist(),
+        )
+
+    # Convert total seconds to minutes
+    total_listening_minutes = total_listening_seconds / 60.0
+
+    # Calculate missed days (days since account creation without sessions)
+    now = datetime.now(timezone.utc)
+    days_since_signup = (now.date() - account_created_at.date()).days + 1
+    missed_days = max(0, days_since_signup - active_days)
+
+    category_distribution = LifetimeCategoryDistribution(**_category_percentages(category_totals))
+
+    logger.info(
+        "[STATS] Lifetime stats for user %s: %d sessions, %.2f minutes, %d active days",
+        uid, total_sessions, total_listening_minutes, active_days,
+        extra={"uid": uid, "sessions": total_sessions, "minutes": total_listening_minutes},
+    )
+    logger.debug(
+        "[STATS] Category totals: gossip=%.2f, unethical=%.2f, waste=%.2f, productive=%.2f",
+        category_totals['gossip'], category_totals['unethical'], category_totals['waste'], category_totals['productive'],
+    )
+
+    if columnar:
+        response_cls = LifetimeStatsColumnarResponse
+        monthly_average_series = series
+    else:
+        response_cls = LifetimeStatsResponse
+        monthly_average_series = [
+            MonthlyAverage(
+                year=year,
+                month=month,
+                month_name=month_name,
+                average_minutes_per_day=average_minutes_per_day,
+                total_sessions=sessions_in_month,
+                total_minutes=minutes_in_month,
+            )
+            for year, month, month_name, average_minutes_per_day, sessions_in_month, minutes_in_month in zip(
+                series.years, series.months, series.month_names,
+                series.average_minutes_per_day, series.total_sessions, series.total_minutes,
+            )
+        ]
+
+    return response_cls(
+        total_sessions=total_sessions,
+        total_listening_minutes=round(total_listening_minutes, 1),
+        active_days=active_days,
+        missed_days=missed_days,
+        monthly_average_series=monthly_average_series,
+        lifetime_category_distribution=category_distribution,
+        account_created_at=account_created_at,
+        first_session_date=first_session_date,
+    )
+
+
 @router.get(
     "/weekly",
     response_model=WeeklyStatsResponse,
@@ -49,186 +429,55 @@ def get_week_start_end():
 )
 def get_weekly_stats(
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> WeeklyStatsResponse:
+) -> Response:
     """Get weekly statistics for the current user.
-    
+
     Calculates statistics for the current week (Monday to Sunday), including:
     - Total sessions in the week
     - Total listening minutes in the week
     - Daily totals for each day (Monday through Sunday)
     - Weekly category distribution (gossip, unethical, waste, productive)
-    
+
     Only includes sessions with status STOPPED.
     Week starts on Monday.
-    
+
     Args:
         current_user: The authenticated user object (injected via dependency)
-        
+
     Returns:
         WeeklyStatsResponse: Aggregated weekly statistics with daily breakdown
     """
     try:
         uid = current_user["uid"]
-        db = get_firestore_db()
-        
+
         # Get week boundaries (Monday to Sunday)
         week_start, week_end = get_week_start_end()
-        
-        # Query for all stopped sessions for this user
-        sessions_query = db.collection('listening_sessions') \
-            .where('uid', '==', uid) \
-            .where('status', '==', 'STOPPED') \
-            .stream()
-        
-        # Aggregate statistics
-        total_sessions_week = 0
-        total_listening_seconds_week = 0
-        
-        # Daily totals: date string (YYYY-MM-DD) -> {minutes, sessions}
-        daily_totals_dict: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"minutes": 0.0, "sessions": 0})
-        
-        # Category totals (for now, these will be placeholders until AI analysis is available)
-        category_totals = {
-            "gossip": 0,
-            "unethical": 0,
-            "waste": 0,
-            "productive": 0,
-        }
-        
-        for doc in sessions_query:
-            session_data = doc.to_dict()
-            
-            # Only process stopped sessions with completed analysis
-            if session_data.get('status') != 'STOPPED':
-                continue
-            
-            # NOTE: We count ALL STOPPED sessions for totals/minutes.
-            # Category distribution is computed only when `classification` is present.
-            
-            # Get startedAt timestamp
-            started_at = session_data.get('startedAt')
-            if not started_at:
-                continue
-            
-            # Convert Firestore Timestamp to datetime if needed
-            if hasattr(started_at, 'timestamp'):
-                started_at_dt = datetime.fromtimestamp(started_at.timestamp(), tz=timezone.utc)
-            elif isinstance(started_at, datetime):
-                started_at_dt = started_at
-                if started_at_dt.tzinfo is None:
-                    started_at_dt = started_at_dt.replace(tzinfo=timezone.utc)
-            else:
-                continue
-            
-            # Filter by week range
-            if started_at_dt < week_start or started_at_dt > week_end:
-                continue
-            
-            # Ensure totals is properly structured
-            totals = session_data.get('totals', {})
-            if not isinstance(totals, dict):
-                totals = {}
-            
-            # Extract listening time
-            total_seconds = totals.get('totalSeconds', 0)
-            total_minutes = total_seconds / 60.0
-            
-            # Aggregate week totals
-            total_sessions_week += 1
-            total_listening_seconds_week += total_seconds
-            
-            # Aggregate daily totals
-            date_key = started_at_dt.date().isoformat()  # YYYY-MM-DD
-            daily_totals_dict[date_key]["minutes"] += total_minutes
-            daily_totals_dict[date_key]["sessions"] += 1
-            
-            # Extract category data from AI classification
-            # IMPORTANT: Include ALL sessions with classification data, even if scores are low
-            # Any session with at least one category detected should be included in stats
-            classification = session_data.get('classification', {})
-            if classification and isinstance(classification, dict) and len(classification) > 0:
-                # Map classification labels to our category names
-                # Ensure scores are floats (handle string conversion if needed)
-                gossip_score = float(classification.get('gossip', 0.0) or 0.0)
-                unethical_score = float(classification.get('insult or unethical speech', 0.0) or 0.0)
-                waste_score = float(classification.get('wasteful talk', 0.0) or 0.0)
-                productive_score = float(classification.get('productive or meaningful speech', 0.0) or 0.0)
-                
-                # Debug logging for first few sessions with classification
-                if total_sessions_week < 3:
-                    print(f"[STATS] Session included - classification: {classification}")
-                    print(f"[STATS] Extracted scores: gossip={gossip_score}, unethical={unethical_score}, waste={waste_score}, productive={productive_score}, minutes={total_minutes:.2f}")
-                
-                # Add scores to category totals (weighted by session duration in minutes)
-                # Even if scores are low, they contribute to the distribution
-                category_totals["gossip"] += gossip_score * total_minutes
-                category_totals["unethical"] += unethical_score * total_minutes
-                category_totals["waste"] += waste_score * total_minutes
-                category_totals["productive"] += productive_score * total_minutes
-        
-        # Convert total seconds to minutes
-        total_listening_minutes_week = total_listening_seconds_week / 60.0
-        
-        # Generate daily totals for all 7 days of the week (Monday through Sunday)
-        daily_totals: List[DailyTotal] = []
-        current_date = week_start.date()
-        for i in range(7):
-            date_key = current_date.isoformat()
-            daily_data = daily_totals_dict.get(date_key, {"minutes": 0.0, "sessions": 0})
-            daily_totals.append(DailyTotal(
-                date=date_key,
-                minutes=round(daily_data["minutes"], 1),
-                sessions=daily_data["sessions"]
-            ))
-            current_date += timedelta(days=1)
-        
-        # Calculate category distribution percentages
-        # For now, all zeros until AI analysis is available
-        total_category = sum(category_totals.values())
-        if total_category > 0:
-            category_distribution = WeeklyCategoryDistribution(
-                gossip=round((category_totals["gossip"] / total_category) * 100, 1),
-                unethical=round((category_totals["unethical"] / total_category) * 100, 1),
-                waste=round((category_totals["waste"] / total_category) * 100, 1),
-                productive=round((category_totals["productive"] / total_category) * 100, 1),
-            )
-        else:
-            category_distribution = WeeklyCategoryDistribution(
-                gossip=0.0,
-                unethical=0.0,
-                waste=0.0,
-                productive=0.0,
-            )
-        
-        print(f"[STATS] Weekly stats for user {uid}: {total_sessions_week} sessions, {total_listening_minutes_week:.2f} minutes")
-        print(f"[STATS] Category totals: gossip={category_totals['gossip']:.2f}, unethical={category_totals['unethical']:.2f}, waste={category_totals['waste']:.2f}, productive={category_totals['productive']:.2f}")
-        
-        return WeeklyStatsResponse(
-            total_sessions_week=total_sessions_week,
-            total_listening_minutes_week=round(total_listening_minutes_week, 1),
-            daily_totals=daily_totals,
-            weekly_category_distribution=category_distribution,
-            week_start=week_start,
-            week_end=week_end,
-        )
-        
+
+        period = week_start.date()
+        cached = get_cached_stats_response('weekly', uid, period)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
+        week_acc = _WindowAccumulator(week_start, week_end)
+
+        # Parsed STOPPED sessions (shared with the other stats endpoints)
+        for session in get_stopped_sessions(uid, since=week_start, until=week_end):
+            _accumulate(session, [week_acc])
+
+        response = _build_weekly_response(uid, week_acc)
+        # Serialize once in pydantic-core and cache the JSON body itself
+        body = response.model_dump_json()
+        cache_stats_response('weekly', uid, period, body)
+        return Response(content=body, media_type="application/json")
+
     except Exception as e:
-        print(f"[STATS] Error generating weekly stats: {e}")
+        logger.error("[STATS] Error generating weekly stats: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate weekly statistics"
         )
 
 
-def get_month_start_end(year: int, month: int):
-    """Get the start and end of a specific month."""
-    from calendar import monthrange
-    month_start = datetime(year, month, 1, 0, 0, 0, 0, tzinfo=timezone.utc)
-    last_day = monthrange(year, month)[1]
-    month_end = datetime(year, month, last_day, 23, 59, 59, 999999, tzinfo=timezone.utc)
-    return month_start, month_end
-
-
 @router.get(
     "/monthly",
     response_model=MonthlyStatsResponse,
@@ -250,189 +499,53 @@ def get_monthly_stats(
     year: int = None,
     month: int = None,
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> MonthlyStatsResponse:
+) -> Response:
     """Get monthly statistics for the current user.
-    
+
     Calculates statistics for a specific month (defaults to current month), including:
     - Total sessions in the month
     - Total listening minutes in the month
     - Daily totals for each day of the month
     - Monthly category distribution (gossip, unethical, waste, productive)
-    
+
     Only includes sessions with status STOPPED.
-    
+
     Args:
         year: Year (YYYY format). Defaults to current year if not provided.
         month: Month (1-12). Defaults to current month if not provided.
         current_user: The authenticated user object (injected via dependency)
-        
+
     Returns:
         MonthlyStatsResponse: Aggregated monthly statistics with daily breakdown
     """
     try:
         uid = current_user["uid"]
-        db = get_firestore_db()
-        
+
         # Get month boundaries (default to current month if not specified)
-        now = datetime.now(timezone.utc)
-        target_year = year if year is not None else now.year
-        target_month = month if month is not None else now.month
-        
-        # Validate month
-        if target_month < 1 or target_month > 12:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid month. Must be between 1 and 12."
-            )
-        
+        target_year, target_month = _resolve_month(year, month)
+
+        period = (target_year, target_month)
+        cached = get_cached_stats_response('monthly', uid, period)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
         month_start, month_end = get_month_start_end(target_year, target_month)
-        
-        # Query for all stopped sessions for this user
-        sessions_query = db.collection('listening_sessions') \
-            .where('uid', '==', uid) \
-            .where('status', '==', 'STOPPED') \
-            .stream()
-        
-        # Aggregate statistics
-        total_sessions_month = 0
-        total_listening_seconds_month = 0
-        
-        # Daily totals: date string (YYYY-MM-DD) -> {minutes, sessions}
-        daily_totals_dict: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"minutes": 0.0, "sessions": 0})
-        
-        # Category totals (for now, these will be placeholders until AI analysis is available)
-        category_totals = {
-            "gossip": 0,
-            "unethical": 0,
-            "waste": 0,
-            "productive": 0,
-        }
-        
-        for doc in sessions_query:
-            session_data = doc.to_dict()
-            
-            # Only process stopped sessions with completed analysis
-            if session_data.get('status') != 'STOPPED':
-                continue
-            
-            # NOTE: We count ALL STOPPED sessions for totals/minutes.
-            # Category distribution is computed only when `classification` is present.
-            
-            # Get startedAt timestamp
-            started_at = session_data.get('startedAt')
-            if not started_at:
-                continue
-            
-            # Convert Firestore Timestamp to datetime if needed
-            if hasattr(started_at, 'timestamp'):
-                started_at_dt = datetime.fromtimestamp(started_at.timestamp(), tz=timezone.utc)
-            elif isinstance(started_at, datetime):
-                started_at_dt = started_at
-                if started_at_dt.tzinfo is None:
-                    started_at_dt = started_at_dt.replace(tzinfo=timezone.utc)
-            else:
-                continue
-            
-            # Filter by month range
-            if started_at_dt < month_start or started_at_dt > month_end:
-                continue
-            
-            # Ensure totals is properly structured
-            totals = session_data.get('totals', {})
-            if not isinstance(totals, dict):
-                totals = {}
-            
-            # Extract listening time
-            total_seconds = totals.get('totalSeconds', 0)
-            total_minutes = total_seconds / 60.0
-            
-            # Aggregate month totals
-            total_sessions_month += 1
-            total_listening_seconds_month += total_seconds
-            
-            # Aggregate daily totals
-            date_key = started_at_dt.date().isoformat()  # YYYY-MM-DD
-            daily_totals_dict[date_key]["minutes"] += total_minutes
-            daily_totals_dict[date_key]["sessions"] += 1
-            
-            # Extract category data from AI classification
-            # IMPORTANT: Include ALL sessions with classification data, even if scores are low
-            # Any session with at least one category detected should be included in stats
-            classification = session_data.get('classification', {})
-            if classification and isinstance(classification, dict) and len(classification) > 0:
-                # Map classification labels to our category names
-                # Ensure scores are floats (handle string conversion if needed)
-                gossip_score = float(classification.get('gossip', 0.0) or 0.0)
-                unethical_score = float(classification.get('insult or unethical speech', 0.0) or 0.0)
-                waste_score = float(classification.get('wasteful talk', 0.0) or 0.0)
-                productive_score = float(classification.get('productive or meaningful speech', 0.0) or 0.0)
-                
-                # Add scores to category totals (weighted by session duration in minutes)
-                # Even if scores are low, they contribute to the distribution
-                category_totals["gossip"] += gossip_score * total_minutes
-                category_totals["unethical"] += unethical_score * total_minutes
-                category_totals["waste"] += waste_score * total_minutes
-                category_totals["productive"] += productive_score * total_minutes
-        
-        # Convert total seconds to minutes
-        total_listening_minutes_month = total_listening_seconds_month / 60.0
-        
-        # Generate daily totals for all days of the month
-        from calendar import monthrange
-        per_day_totals: List[PerDayTotal] = []
-        num_days = monthrange(target_year, target_month)[1]
-        current_date = month_start.date()
-        
-        for i in range(num_days):
-            date_key = current_date.isoformat()
-            daily_data = daily_totals_dict.get(date_key, {"minutes": 0.0, "sessions": 0})
-            per_day_totals.append(PerDayTotal(
-                date=date_key,
-                minutes=round(daily_data["minutes"], 1),
-                sessions=daily_data["sessions"]
-            ))
-            current_date += timedelta(days=1)
-        
-        # Calculate category distribution percentages
-        # For now, all zeros until AI analysis is available
-        total_category = sum(category_totals.values())
-        if total_category > 0:
-            category_distribution = MonthlyCategoryDistribution(
-                gossip=round((category_totals["gossip"] / total_category) * 100, 1),
-                unethical=round((category_totals["unethical"] / total_category) * 100, 1),
-                waste=round((category_totals["waste"] / total_category) * 100, 1),
-                productive=round((category_totals["productive"] / total_category) * 100, 1),
-            )
-        else:
-            category_distribution = MonthlyCategoryDistribution(
-                gossip=0.0,
-                unethical=0.0,
-                waste=0.0,
-                productive=0.0,
-            )
-        
-        # Format month name
-        month_names = ["", "January", "February", "March", "April", "May", "June",
-                      "July", "August", "September", "October", "November", "December"]
-        month_name = f"{month_names[target_month]} {target_year}"
-        
-        print(f"[STATS] Monthly stats for user {uid}, {month_name}: {total_sessions_month} sessions, {total_listening_minutes_month:.2f} minutes")
-        print(f"[STATS] Category totals: gossip={category_totals['gossip']:.2f}, unethical={category_totals['unethical']:.2f}, waste={category_totals['waste']:.2f}, productive={category_totals['productive']:.2f}")
-        
-        return MonthlyStatsResponse(
-            total_sessions_month=total_sessions_month,
-            total_listening_minutes_month=round(total_listening_minutes_month, 1),
-            per_day_totals=per_day_totals,
-            month_category_distribution=category_distribution,
-            month_start=month_start,
-            month_end=month_end,
-            month_name=month_name,
-        )
-        
+        month_acc = _WindowAccumulator(month_start, month_end)
+
+        # Parsed STOPPED sessions (shared with the other stats endpoints)
+        for session in get_stopped_sessions(uid, since=month_start, until=month_end):
+            _accumulate(session, [month_acc])
+
+        response = _build_monthly_response(uid, month_acc, target_year, target_month)
+        # Serialize once in pydantic-core and cache the JSON body itself
+        body = response.model_dump_json()
+        cache_stats_response('monthly', uid, period, body)
+        return Response(content=body, media_type="application/json")
+
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[STATS] Error generating monthly stats: {e}")
+        logger.error("[STATS] Error generating monthly stats: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate monthly statistics"
@@ -441,9 +554,10 @@ def get_monthly_stats(
 
 @router.get(
     "/lifetime",
-    response_model=LifetimeStatsResponse,
+    response_model=Union[LifetimeStatsResponse, LifetimeStatsColumnarResponse],
     summary="Get lifetime statistics",
-    description="Returns aggregated lifetime statistics including monthly averages and category distribution.",
+    description="Returns aggregated lifetime statistics including monthly averages and category distribution. "
+                "With layout=columns the monthly averages are returned as parallel arrays.",
     responses={
         200: {
             "description": "Lifetime statistics retrieved successfully",
@@ -454,10 +568,11 @@ def get_monthly_stats(
     },
 )
 def get_lifetime_stats(
+    layout: Literal["rows", "columns"] = "rows",
     current_user: Dict[str, Any] = Depends(get_current_user)
-) -> LifetimeStatsResponse:
+) -> Response:
     """Get lifetime statistics for the current user.
-    
+
     Calculates statistics for all time since account creation, including:
     - Total sessions in lifetime
     - Total listening minutes in lifetime
@@ -465,210 +580,116 @@ def get_lifetime_stats(
     - Missed days (days without sessions since signup)
     - Monthly average series (monthly averages since signup)
     - Lifetime category distribution (gossip, unethical, waste, productive)
-    
+
     Only includes sessions with status STOPPED.
-    
+
     Args:
+        layout: "rows" (one object per month) or "columns" (parallel arrays, smaller payload)
         current_user: The authenticated user object (injected via dependency)
-        
+
     Returns:
-        LifetimeStatsResponse: Aggregated lifetime statistics with monthly breakdown
+        LifetimeStatsResponse (or LifetimeStatsColumnarResponse): Aggregated lifetime
+            statistics with monthly breakdown
     """
     try:
         uid = current_user["uid"]
-        db = get_firestore_db()
-        
-        # Get user profile to find account creation date
-        user_doc = db.collection('users').document(uid).get()
-        if not user_doc.exists:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User profile not found"
-            )
-        
-        user_data = user_doc.to_dict()
-        account_created_at = user_data.get('createdAt')
-        if account_created_at:
-            if hasattr(account_created_at, 'timestamp'):
-                account_created_at = datetime.fromtimestamp(account_created_at.timestamp(), tz=timezone.utc)
-            elif isinstance(account_created_at, datetime):
-                if account_created_at.tzinfo is None:
-                    account_created_at = account_created_at.replace(tzinfo=timezone.utc)
-        else:
-            # Fallback to a reasonable default (1 year ago)
-            account_created_at = datetime.now(timezone.utc) - timedelta(days=365)
-        
-        # Query for all stopped sessions for this user
-        sessions_query = db.collection('listening_sessions') \
-            .where('uid', '==', uid) \
-            .where('status', '==', 'STOPPED') \
-            .stream()
-        
-        # Aggregate statistics
-        total_sessions = 0
-        total_listening_seconds = 0
-        first_session_date = None
-        
-        # Track sessions by date
-        sessions_by_date: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"minutes": 0.0, "sessions": 0})
-        
-        # Track sessions by month for monthly averages
-        sessions_by_month: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"minutes": 0.0, "sessions": 0, "days": set()})
-        
-        # Category totals (for now, these will be placeholders until AI analysis is available)
-        category_totals = {
-            "gossip": 0,
-            "unethical": 0,
-            "waste": 0,
-            "productive": 0,
-        }
-        
-        for doc in sessions_query:
-            session_data = doc.to_dict()
-            
-            # Only process stopped sessions with completed analysis
-            if session_data.get('status') != 'STOPPED':
-                continue
-            
-            # NOTE: We count ALL STOPPED sessions for totals/minutes.
-            # Category distribution is computed only when `classification` is present.
-            
-            # Get startedAt timestamp
-            started_at = session_data.get('startedAt')
-            if not started_at:
-                continue
-            
-            # Convert Firestore Timestamp to datetime if needed
-            if hasattr(started_at, 'timestamp'):
-                started_at_dt = datetime.fromtimestamp(started_at.timestamp(), tz=timezone.utc)
-            elif isinstance(started_at, datetime):
-                started_at_dt = started_at
-                if started_at_dt.tzinfo is None:
-                    started_at_dt = started_at_dt.replace(tzinfo=timezone.utc)
-            else:
-                continue
-            
-            # Track first session
-            if first_session_date is None or started_at_dt < first_session_date:
-                first_session_date = started_at_dt
-            
-            # Ensure totals is properly structured
-            totals = session_data.get('totals', {})
-            if not isinstance(totals, dict):
-                totals = {}
-            
-            # Extract listening time
-            total_seconds = totals.get('totalSeconds', 0)
-            total_minutes = total_seconds / 60.0
-            
-            # Aggregate lifetime totals
-            total_sessions += 1
-            total_listening_seconds += total_seconds
-            
-            # Aggregate by date
-            date_key = started_at_dt.date().isoformat()  # YYYY-MM-DD
-            sessions_by_date[date_key]["minutes"] += total_minutes
-            sessions_by_date[date_key]["sessions"] += 1
-            
-            # Aggregate by month
-            month_key = started_at_dt.strftime("%Y-%m")  # YYYY-MM
-            sessions_by_month[month_key]["minutes"] += total_minutes
-            sessions_by_month[month_key]["sessions"] += 1
-            sessions_by_month[month_key]["days"].add(date_key)
-            
-            # Extract category data from AI classification
-            # IMPORTANT: Include ALL sessions with classification data, even if scores are low
-            # Any session with at least one category detected should be included in stats
-            classification = session_data.get('classification', {})
-            if classification and isinstance(classification, dict) and len(classification) > 0:
-                # Map classification labels to our category names
-                # Ensure scores are floats (handle string conversion if needed)
-                gossip_score = float(classification.get('gossip', 0.0) or 0.0)
-                unethical_score = float(classification.get('insult or unethical speech', 0.0) or 0.0)
-                waste_score = float(classification.get('wasteful talk', 0.0) or 0.0)
-                productive_score = float(classification.get('productive or meaningful speech', 0.0) or 0.0)
-                
-                # Add scores to category totals (weighted by session duration in minutes)
-                # Even if scores are low, they contribute to the distribution
-                category_totals["gossip"] += gossip_score * total_minutes
-                category_totals["unethical"] += unethical_score * total_minutes
-                category_totals["waste"] += waste_score * total_minutes
-                category_totals["productive"] += productive_score * total_minutes
-        
-        # Convert total seconds to minutes
-        total_listening_minutes = total_listening_seconds / 60.0
-        
-        # Calculate active days
-        active_days = len(sessions_by_date)
-        
-        # Calculate missed days (days since account creation without sessions)
-        now = datetime.now(timezone.utc)
-        days_since_signup = (now.date() - account_created_at.date()).days + 1
-        missed_days = max(0, days_since_signup - active_days)
-        
-        # Generate monthly average series
-        monthly_average_series: List[MonthlyAverage] = []
-        month_names = ["", "January", "February", "March", "April", "May", "June",
-                      "July", "August", "September", "October", "November", "December"]
-        
-        # Sort months chronologically
-        sorted_months = sorted(sessions_by_month.keys())
-        
-        for month_key in sorted_months:
-            year, month = map(int, month_key.split('-'))
-            month_data = sessions_by_month[month_key]
-            days_in_month = len(month_data["days"])
-            
-            # Calculate average minutes per day for this month
-            average_minutes_per_day = month_data["minutes"] / days_in_month if days_in_month > 0 else 0.0
-            
-            monthly_average_series.append(MonthlyAverage(
-                year=year,
-                month=month,
-                month_name=f"{month_names[month]} {year}",
-                average_minutes_per_day=round(average_minutes_per_day, 1),
-                total_sessions=month_data["sessions"],
-                total_minutes=round(month_data["minutes"], 1),
-            ))
-        
-        # Calculate category distribution percentages
-        # For now, all zeros until AI analysis is available
-        total_category = sum(category_totals.values())
-        if total_category > 0:
-            category_distribution = LifetimeCategoryDistribution(
-                gossip=round((category_totals["gossip"] / total_category) * 100, 1),
-                unethical=round((category_totals["unethical"] / total_category) * 100, 1),
-                waste=round((category_totals["waste"] / total_category) * 100, 1),
-                productive=round((category_totals["productive"] / total_category) * 100, 1),
-            )
-        else:
-            category_distribution = LifetimeCategoryDistribution(
-                gossip=0.0,
-                unethical=0.0,
-                waste=0.0,
-                productive=0.0,
-            )
-        
-        print(f"[STATS] Lifetime stats for user {uid}: {total_sessions} sessions, {total_listening_minutes:.2f} minutes, {active_days} active days")
-        print(f"[STATS] Category totals: gossip={category_totals['gossip']:.2f}, unethical={category_totals['unethical']:.2f}, waste={category_totals['waste']:.2f}, productive={category_totals['productive']:.2f}")
-        
-        return LifetimeStatsResponse(
-            total_sessions=total_sessions,
-            total_listening_minutes=round(total_listening_minutes, 1),
-            active_days=active_days,
-            missed_days=missed_days,
-            monthly_average_series=monthly_average_series,
-            lifetime_category_distribution=category_distribution,
-            account_created_at=account_created_at,
-            first_session_date=first_session_date,
-        )
-        
+
+        # Missed days depend on today's date, so key the cache by it (and the layout)
+        period = (datetime.now(timezone.utc).date(), layout)
+        cached = get_cached_stats_response('lifetime', uid, period)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
+        # Account creation date and parsed STOPPED sessions, fetched in parallel
+        account_created_at, sessions = _fetch_lifetime_inputs(uid)
+
+        response = _build_lifetime_response(uid, sessions, account_created_at, columnar=layout == "columns")
+        # Serialize once in pydantic-core and cache the JSON body itself
+        body = response.model_dump_json()
+        cache_stats_response('lifetime', uid, period, body)
+        return Response(content=body, media_type="application/json")
+
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[STATS] Error generating lifetime stats: {e}")
+        logger.error("[STATS] Error generating lifetime stats: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate lifetime statistics"
         )
 
+
+@router.get(
+    "/summary",
+    response_model=CombinedStatsResponse,
+    summary="Get weekly, monthly and lifetime statistics",
+    description="Returns the weekly, monthly and lifetime statistics computed from a single pass over the user's sessions. Supports month selection via query parameters.",
+    responses={
+        200: {
+            "description": "Statistics retrieved successfully",
+        },
+        400: {
+            "description": "Invalid year or month parameter",
+        },
+        401: {
+            "description": "Unauthorized - Invalid or missing authentication token",
+        },
+    },
+)
+def get_stats_summary(
+    year: int = None,
+    month: int = None,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+) -> Response:
+    """Get weekly, monthly and lifetime statistics for the current user.
+
+    Equivalent to calling /stats/weekly, /stats/monthly and /stats/lifetime,
+    but the sessions are read and aggregated once for all three panels.
+
+    Args:
+        year: Year for the monthly panel (YYYY format). Defaults to current year.
+        month: Month for the monthly panel (1-12). Defaults to current month.
+        current_user: The authenticated user object (injected via dependency)
+
+    Returns:
+        CombinedStatsResponse: Weekly, monthly and lifetime statistics
+    """
+    try:
+        uid = current_user["uid"]
+
+        target_year, target_month = _resolve_month(year, month)
+
+        period = (datetime.now(timezone.utc).date(), target_year, target_month)
+        cached = get_cached_stats_response('summary', uid, period)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+
+        week_start, week_end = get_week_start_end()
+        month_start, month_end = get_month_start_end(target_year, target_month)
+        week_acc = _WindowAccumulator(week_start, week_end)
+        month_acc = _WindowAccumulator(month_start, month_end)
+
+        # Lifetime needs every session, so one fetch covers all three windows
+        account_created_at, sessions = _fetch_lifetime_inputs(uid)
+        accumulators = [week_acc, month_acc]
+        for session in sessions:
+            _accumulate(session, accumulators)
+
+        response = CombinedStatsResponse(
+            weekly=_build_weekly_response(uid, week_acc),
+            monthly=_build_monthly_response(uid, month_acc, target_year, target_month),
+            lifetime=_build_lifetime_response(uid, sessions, account_created_at),
+        )
+        # Serialize once in pydantic-core and cache the JSON body itself
+        body = response.model_dump_json()
+        cache_stats_response('summary', uid, period, body)
+        return Response(content=body, media_type="application/json")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("[STATS] Error generating stats summary: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate statistics summary"
+        )
@@ -1,12 +1,18 @@
-from typing import Dict, Any, List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from typing import Dict, Any, List, Tuple, Union
+import asyncio
+import hashlib
+import logging
+import weakref
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form
 from datetime import datetime, timezone
 import random
 import os
 import tempfile
+import shutil
 import numpy as np
+from cachetools import TTLCache
 
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_user, get_current_user_strict
 from app.models.voice import (
     VoiceProfile,
     StartVoiceRegistrationRequest,
@@ -18,12 +24,27 @@ from app.models.voice import (
     VoiceVerificationResponse,
     VoiceStatusResponse,
 )
-from app.services.embedding_service import extract_speaker_embedding
 from app.services.audio_quality_service import validate_audio_quality, validate_enrollment_audio
 from app.services.model_versioning_service import get_current_model_metadata
-from app.services.verification_service import verify_speaker, cosine_similarity
+from app.services.session_cache import to_utc
+from app.services.verification_service import (
+    verify_speaker,
+    encode_embeddings,
+    encode_quantized_embeddings,
+    decode_quantized_embeddings,
+    load_enrollment_embeddings,
+)
+from app.services.similarity_kernels import cosine_similarity_matrix
+from app.services.enrollment_audio_service import (
+    EnrollmentSampleError,
+    enrollment_executor,
+    prepare_enrollment_sample,
+)
 from app.models.voice import EnrollmentEmbeddingMetadata
-from firebase_admin import firestore
+from firebase_admin import firestore, firestore_async
+from google.api_core import exceptions as gcp_exceptions, retry_async
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/voice",
@@ -34,24 +55,218 @@ router = APIRouter(
 # Prompt 1 (neutral identity)
 # Prompt 2 (natural continuous speech)
 # Prompt 3 (longer, varied phonetics)
-SAMPLE_TEXTS = [
+SAMPLE_TEXTS = (
     "I am registering my voice so the application can recognize me during my reflection sessions.",
     "Today I am speaking clearly and naturally. This recording helps the system learn my speaking style.",
     "Reflection helps me become more mindful of my words, actions, and intentions over time.",
-]
+)
+
+# Dedicated RNG so sample-text picks don't contend on the global random state;
+# its choice() is bound once so each pick is a single global lookup
+_rng = random.Random()
+_choice = _rng.choice
+
+# Firestore errors worth retrying instead of failing the request
+_TRANSIENT_FIRESTORE_ERRORS = (
+    gcp_exceptions.Aborted,
+    gcp_exceptions.DeadlineExceeded,
+    gcp_exceptions.ServiceUnavailable,
+)
+
+# Exponential backoff (with jitter) for the idempotent profile reads/writes
+_FIRESTORE_RETRY = retry_async.AsyncRetry(
+    predicate=retry_async.if_exception_type(*_TRANSIENT_FIRESTORE_ERRORS),
+    initial=0.1,
+    maximum=2.0,
+    multiplier=2.0,
+    timeout=10.0,
+)
+
+
+async def _run_profile_txn(db, txn_func, *args):
+    """Run a voice profile transaction, retrying transient Firestore errors.
+
+    Each attempt runs in a fresh transaction; the start and complete
+    transactions are idempotent, so re-running one after a failed attempt
+    is safe.
+    """
+    return await _FIRESTORE_RETRY(lambda: txn_func(db.transaction(), *args))()
+
+
+_db = None
 
 
 def get_firestore_db():
-    """Get Firestore database instance."""
-    try:
-        return firestore.client()
-    except Exception as e:
-        raise RuntimeError(f"Firestore not available: {e}")
+    """Get the shared Firestore client (created on first use).
+
+    Reusing one client keeps its gRPC channel warm across requests and
+    skips the per-call app lookup in firestore.client().
+    """
+    global _db
+    if _db is None:
+        try:
+            _db = firestore.client()
+        except Exception as e:
+            raise RuntimeError(f"Firestore not available: {e}")
+    return _db
+
+
+# uid -> {'status', 'sampleText'} for the registration start endpoint, which
+# onboarding clients call repeatedly. Kept warm by complete, dropped on
+# enroll/delete.
+_profile_cache: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+# uid -> asyncio.Lock so concurrent cache misses for one user share one read
+_profile_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+# uid -> (enrollment matrix, normalized, quantized) for /verify, so repeat
+# verifications skip the Firestore read and blob decode. Dropped on
+# enroll/delete.
+_enrollment_cache: TTLCache = TTLCache(maxsize=2048, ttl=300)
+
+_async_db = None
+
+
+def get_async_firestore_db():
+    """Get the shared async Firestore client (created on first use).
+
+    Used by the async endpoints so Firestore round-trips are awaited on the
+    event loop instead of occupying a threadpool worker.
+    """
+    global _async_db
+    if _async_db is None:
+        try:
+            _async_db = firestore_async.client()
+        except Exception as e:
+            raise RuntimeError(f"Firestore not available: {e}")
+    return _async_db
+
+
+# (client, collection) pairs for voice_profiles, one per client in use
+_voice_collections: Dict[int, tuple] = {}
+
+
+def _voice_profiles_collection(db):
+    """Get the voice_profiles CollectionReference for a Firestore client.
+
+    Built once per client so each request only calls .document(uid).
+    """
+    entry = _voice_collections.get(id(db))
+    if entry is None or entry[0] is not db:
+        entry = (db, db.collection('voice_profiles'))
+        _voice_collections[id(db)] = entry
+    return entry[1]
+
+
+async def get_db():
+    """FastAPI dependency providing the shared async Firestore client.
+
+    Declared async so FastAPI resolves it on the event loop rather than in
+    the threadpool; override it via app.dependency_overrides in tests.
+    """
+    return get_async_firestore_db()
 
 
 def get_random_sample_text() -> str:
     """Get a random sample text for voice registration."""
-    return random.choice(SAMPLE_TEXTS)
+    return _choice(SAMPLE_TEXTS)
+
+
+# Uploads are copied to disk in chunks of this size instead of read whole
+UPLOAD_CHUNK_SIZE = 1 << 16
+
+# Accepted recording formats (M4A is normalized to WAV)
+_ALLOWED_AUDIO_EXTENSIONS = frozenset({'wav', 'm4a'})
+
+# Field projections for the read-only endpoints, so Firestore does not
+# return (and the client does not decode) the rest of the profile
+_VERIFY_FIELDS = [
+    'enrollmentEmbeddingsF32', 'enrollmentEmbeddings', 'voiceEmbedding',
+    'embeddingsNormalized', 'quantized', 'enrollmentEmbeddingsI8',
+]
+_STATUS_FIELDS = ['voiceEmbedding', 'registeredAt', 'model']
+
+
+def _copy_spooled_upload(src, dest) -> Tuple[int, bytes]:
+    """Copy a file object through one reused buffer (no bytes per chunk)."""
+    buffer = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buffer)
+    size = 0
+    header = b''
+    while n := src.readinto(buffer):
+        if size == 0:
+            header = bytes(view[:min(n, 12)])
+        dest.write(view[:n])
+        size += n
+    return size, header
+
+
+async def _save_upload(upload: UploadFile, dest) -> Tuple[int, bytes]:
+    """Stream an uploaded file into an open file object.
+
+    Memory use is bounded by UPLOAD_CHUNK_SIZE instead of the file size.
+    When the spooled upload supports readinto(), the whole copy runs in one
+    worker thread through a single reused buffer; otherwise it falls back
+    to chunked async reads.
+
+    Returns:
+        Tuple of (number of bytes written, first 12 bytes of the file)
+    """
+    if hasattr(upload.file, 'readinto'):
+        return await asyncio.to_thread(_copy_spooled_upload, upload.file, dest)
+    
+    size = 0
+    header = b''
+    while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+        if len(header) < 12:
+            header += chunk[:12 - len(header)]
+        dest.write(chunk)
+        size += len(chunk)
+    return size, header
+
+
+def _is_supported_audio_header(header: bytes) -> bool:
+    """Check the file magic: RIFF....WAVE (WAV) or ....ftyp (MP4/M4A)."""
+    return (header[:4] == b'RIFF' and header[8:12] == b'WAVE') or header[4:8] == b'ftyp'
+
+
+def _registration_etag(uid: str, status_value: str, sample_text: str) -> str:
+    """Weak ETag for a /register/start response."""
+    digest = hashlib.blake2b(f"{uid}|{status_value}|{sample_text}".encode(), digest_size=8).hexdigest()
+    return f'W/"{digest}"'
+
+
+@firestore_async.async_transactional
+async def _start_registration_txn(transaction, doc_ref, uid: str):
+    """Return the user's voice profile, creating it if it doesn't exist.
+
+    Runs inside a transaction so concurrent starts cannot both create the
+    profile, and a missing sampleText is filled in the same commit.
+
+    Returns:
+        Tuple of (profile_data, created)
+    """
+    snapshot = await doc_ref.get(transaction=transaction)
+    
+    if snapshot.exists:
+        profile_data = snapshot.to_dict()
+        
+        # Get or generate sample text. A missing or empty one is stored in the
+        # same commit so retries keep getting the same text.
+        if not profile_data.get('sampleText'):
+            profile_data['sampleText'] = get_random_sample_text()
+            transaction.update(doc_ref, {'sampleText': profile_data['sampleText']})
+        return profile_data, False
+    
+    # Create new voice profile (createdAt is stamped by the Firestore server)
+    profile_data = {
+        'uid': uid,
+        'status': 'PENDING',
+        'createdAt': firestore.SERVER_TIMESTAMP,
+        'completedAt': None,
+        'recordingsCount': None,
+        'sampleText': get_random_sample_text(),
+    }
+    transaction.set(doc_ref, profile_data)
+    return profile_data, True
 
 
 @router.post(
@@ -68,90 +283,100 @@ def get_random_sample_text() -> str:
         },
     },
 )
-def start_voice_registration(
+async def start_voice_registration(
     request: StartVoiceRegistrationRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
-) -> StartVoiceRegistrationResponse:
+    http_request: Request,
+    response: Response,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db=Depends(get_db),
+) -> Union[StartVoiceRegistrationResponse, Response]:
     """Start voice registration by creating or retrieving a voice profile.
     
     If a voice profile already exists for the user, returns the existing one.
     Otherwise, creates a new profile with PENDING status.
     
+    Responses carry a weak ETag; a client polling with a matching
+    If-None-Match header gets an empty 304 Not Modified instead.
+    
     Args:
         request: Start voice registration request (no additional fields needed)
+        http_request: The raw HTTP request (for If-None-Match)
+        response: The outgoing response (for the ETag header)
         current_user: The authenticated user object (injected via dependency)
+        db: Async Firestore client (injected via dependency)
         
     Returns:
-        StartVoiceRegistrationResponse: The voice profile with sample text
+        StartVoiceRegistrationResponse: The voice profile with sample text,
+        or an empty 304 response if the client's copy is current
     """
     try:
         uid = current_user["uid"]
-        db = get_firestore_db()
-        
-        # Check if voice profile already exists
-        doc_ref = db.collection('voice_profiles').document(uid)
-        doc = doc_ref.get()
         
-        if doc.exists:
-            # Return existing profile
-            profile_data = doc.to_dict()
-            
-            # Convert timestamps
-            if 'createdAt' in profile_data:
-                created_at = profile_data['createdAt']
-                if hasattr(created_at, 'timestamp'):
-                    profile_data['createdAt'] = datetime.fromtimestamp(created_at.timestamp(), tz=timezone.utc)
-            
-            if 'completedAt' in profile_data and profile_data['completedAt']:
-                completed_at = profile_data['completedAt']
-                if hasattr(completed_at, 'timestamp'):
-                    profile_data['completedAt'] = datetime.fromtimestamp(completed_at.timestamp(), tz=timezone.utc)
-            
-            # Get or generate sample text
-            sample_text = profile_data.get('sampleText') or get_random_sample_text()
-            
-            # Update sample text if not present
-            if 'sampleText' not in profile_data:
-                doc_ref.update({'sampleText': sample_text})
-            
-            print(f"[VOICE] Returning existing voice profile for user {uid}")
-            return StartVoiceRegistrationResponse(
-                uid=uid,
-                status=profile_data.get('status', 'PENDING'),
-                sampleText=sample_text,
-            )
-        
-        # Create new voice profile
-        created_at = datetime.now(timezone.utc)
-        sample_text = get_random_sample_text()
-        
-        profile_data = {
-            'uid': uid,
-            'status': 'PENDING',
-            'createdAt': created_at,
-            'completedAt': None,
-            'recordingsCount': None,
-            'sampleText': sample_text,
-        }
-        
-        # Store in Firestore
-        doc_ref.set(profile_data)
-        
-        print(f"[VOICE] Created new voice profile for user {uid}")
-        return StartVoiceRegistrationResponse(
+        profile_data = _profile_cache.get(uid)
+        if profile_data is None:
+            lock = _profile_locks.setdefault(uid, asyncio.Lock())
+            async with lock:
+                profile_data = _profile_cache.get(uid)
+                if profile_data is None:
+                    # Create-or-return the voice profile atomically in one transaction
+                    # (retried with backoff on transient errors)
+                    doc_ref = _voice_profiles_collection(db).document(uid)
+                    profile_data, created = await _run_profile_txn(db, _start_registration_txn, doc_ref, uid)
+                    profile_data = {
+                        'status': profile_data.get('status', 'PENDING'),
+                        'sampleText': profile_data['sampleText'],
+                    }
+                    _profile_cache[uid] = profile_data
+                    
+                    if created:
+                        logger.info("[VOICE] Created new voice profile for user %s", uid)
+        
+        profile_status = profile_data.get('status', 'PENDING')
+        etag = _registration_etag(uid, profile_status, profile_data['sampleText'])
+        if http_request.headers.get('if-none-match') == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+        response.headers['ETag'] = etag
+        
+        logger.info("[VOICE] Returning voice profile for user %s", uid)
+        # Built from our own stored values; skip re-validating them
+        return StartVoiceRegistrationResponse.model_construct(
             uid=uid,
-            status='PENDING',
-            sampleText=sample_text,
+            status=profile_status,
+            sampleText=profile_data['sampleText'],
         )
         
+    except (gcp_exceptions.RetryError, *_TRANSIENT_FIRESTORE_ERRORS) as e:
+        logger.warning("[VOICE] Firestore unavailable while starting voice registration: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Voice registration is temporarily unavailable, please retry"
+        )
     except Exception as e:
-        print(f"[VOICE] Error starting voice registration: {e}")
+        logger.exception("[VOICE] Error starting voice registration: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to start voice registration"
         )
 
 
+@firestore_async.async_transactional
+async def _complete_registration_txn(transaction, doc_ref, update_data: Dict[str, Any]):
+    """Mark the voice profile READY, based on the version read in this transaction.
+
+    A concurrent write (e.g. enroll, or a start filling in sampleText) makes
+    the commit fail and the transaction re-reads and re-applies the update,
+    so the READY status is never dropped.
+
+    Returns:
+        The profile as read before the update, or None if it doesn't exist
+    """
+    snapshot = await doc_ref.get(transaction=transaction)
+    if not snapshot.exists:
+        return None
+    transaction.update(doc_ref, update_data)
+    return snapshot.to_dict()
+
+
 @router.post(
     "/register/complete",
     response_model=CompleteVoiceRegistrationResponse,
@@ -167,88 +392,108 @@ def start_voice_registration(
         404: {
             "description": "Voice profile not found",
         },
-        403: {
-            "description": "Forbidden - Voice profile does not belong to current user",
-        },
     },
 )
-def complete_voice_registration(
+async def complete_voice_registration(
     request: CompleteVoiceRegistrationRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db=Depends(get_db),
 ) -> CompleteVoiceRegistrationResponse:
     """Complete voice registration by updating the voice profile status.
     
     Marks the profile as READY and stores the completedAt timestamp and recordingsCount.
-    Only the profile owner can complete their own registration.
+    Only the profile owner can complete their own registration: the profile
+    document is keyed by the authenticated uid.
+    
+    The read and the update run in one transaction, and READY is only
+    reported (and cached) once the update has been committed.
     
     Args:
         request: Complete voice registration request with recordingsCount
         current_user: The authenticated user object (injected via dependency)
+        db: Async Firestore client (injected via dependency)
         
     Returns:
         CompleteVoiceRegistrationResponse: The updated voice profile
         
     Raises:
-        HTTPException: 404 if profile not found, 403 if user doesn't own the profile
+        HTTPException: 404 if profile not found
     """
     try:
         uid = current_user["uid"]
-        db = get_firestore_db()
         
-        # Get voice profile document
-        doc_ref = db.collection('voice_profiles').document(uid)
-        doc = doc_ref.get()
+        # Update profile to READY status. completedAt is stamped by the
+        # Firestore server; the response reports the local time instead.
+        update_data = {
+            'status': 'READY',
+            'completedAt': firestore.SERVER_TIMESTAMP,
+            'recordingsCount': request.recordingsCount,
+        }
+        
+        # Read and update the voice profile in one transaction (retried with
+        # backoff on transient errors)
+        doc_ref = _voice_profiles_collection(db).document(uid)
+        profile_data = await _run_profile_txn(db, _complete_registration_txn, doc_ref, update_data)
         
-        if not doc.exists:
+        if profile_data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Voice profile not found. Please start registration first."
             )
         
-        profile_data = doc.to_dict()
-        
-        # Enforce uid ownership (should always match, but check for safety)
-        if profile_data.get('uid') != uid:
+        # The document ID is the caller's uid, so ownership holds by
+        # construction; client access is blocked by firestore.rules.
+        # Debug builds still check it, and log the cause instead of a bare 500.
+        if __debug__ and profile_data.get('uid') != uid:
+            logger.error(
+                "[VOICE] Voice profile %s has uid field %r, which does not match its document ID",
+                uid, profile_data.get('uid'),
+            )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="You do not have permission to complete this voice registration"
+                detail="Voice profile does not belong to current user"
             )
         
-        # Update profile to READY status
-        completed_at = datetime.now(timezone.utc)
-        
-        update_data = {
-            'status': 'READY',
-            'completedAt': completed_at,
-            'recordingsCount': request.recordingsCount,
-        }
-        
-        doc_ref.update(update_data)
-        
-        # Get updated profile data
-        updated_doc = doc_ref.get()
-        updated_data = updated_doc.to_dict()
+        # Write-through: cache READY once it is stored.
+        # Never cache an invented sample text; start assigns and stores one.
+        if profile_data.get('sampleText'):
+            _profile_cache[uid] = {
+                'status': update_data['status'],
+                'sampleText': profile_data['sampleText'],
+            }
+        else:
+            _profile_cache.pop(uid, None)
         
-        # Convert timestamps
-        if 'createdAt' in updated_data:
-            created_at = updated_data['createdAt']
-            if hasattr(created_at, 'timestamp'):
-                updated_data['createdAt'] = datetime.fromtimestamp(created_at.timestamp(), tz=timezone.utc)
+        # Build the response from the profile we already read plus our update
+        # (no second round-trip to re-read the document)
+        profile_data.update(update_data, completedAt=datetime.now(timezone.utc))
         
-        if 'completedAt' in updated_data and updated_data['completedAt']:
-            completed_at = updated_data['completedAt']
-            if hasattr(completed_at, 'timestamp'):
-                updated_data['completedAt'] = datetime.fromtimestamp(completed_at.timestamp(), tz=timezone.utc)
+        # Convert timestamps (completedAt is already a datetime)
+        if 'createdAt' in profile_data:
+            profile_data['createdAt'] = to_utc(profile_data['createdAt'])
         
-        profile = VoiceProfile(**updated_data)
+        # The profile was just read from (and written to) our own store with a
+        # known schema, so construct the models without re-running validation
+        if profile_data.get('enrollmentMetadata'):
+            profile_data['enrollmentMetadata'] = [
+                EnrollmentEmbeddingMetadata.model_construct(**item)
+                for item in profile_data['enrollmentMetadata']
+            ]
+        profile = VoiceProfile.model_construct(**profile_data)
         
-        print(f"[VOICE] Completed voice registration for user {uid} with {request.recordingsCount} recordings")
-        return CompleteVoiceRegistrationResponse(profile=profile)
+        logger.info("[VOICE] Completed voice registration for user %s with %s recordings", uid, request.recordingsCount)
+        return CompleteVoiceRegistrationResponse.model_construct(profile=profile)
         
     except HTTPException:
         raise
+    except (gcp_exceptions.RetryError, *_TRANSIENT_FIRESTORE_ERRORS) as e:
+        logger.warning("[VOICE] Firestore unavailable while completing voice registration: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Voice registration is temporarily unavailable, please retry"
+        )
     except Exception as e:
-        print(f"[VOICE] Error completing voice registration: {e}")
+        logger.exception("[VOICE] Error completing voice registration: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to complete voice registration"
@@ -298,15 +543,15 @@ async def validate_audio_file(
         file_extension = os.path.splitext(audio_file.filename or 'audio.wav')[1] or '.wav'
         temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_extension)
         
-        # Read and save file content
-        content = await audio_file.read()
-        if len(content) == 0:
+        # Stream file content to disk. Any container is accepted here and left
+        # to the decoder; only enrollment restricts uploads to WAV/M4A.
+        size, _ = await _save_upload(audio_file, temp_file)
+        if size == 0:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Audio file is empty"
             )
         
-        temp_file.write(content)
         temp_file.close()
         
         # Normalize audio to 16kHz WAV before validation (handles format conversion)
@@ -320,7 +565,7 @@ async def validate_audio_file(
             validation_file = normalized_file.name
         except Exception as normalize_error:
             # If normalization fails, try validating original file
-            print(f"[VOICE] Normalization failed, using original file: {normalize_error}")
+            logger.warning("[VOICE] Normalization failed, using original file: %s", normalize_error)
             validation_file = temp_file.name
         
         # Validate audio quality (now guaranteed to be WAV at 16kHz if normalization succeeded)
@@ -343,7 +588,7 @@ async def validate_audio_file(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[VOICE] Error validating audio file: {e}")
+        logger.error("[VOICE] Error validating audio file: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Could not analyze audio file. Please try recording again."
@@ -354,12 +599,12 @@ async def validate_audio_file(
             try:
                 os.unlink(temp_file.name)
             except Exception as e:
-                print(f"[VOICE] Error deleting temp file: {e}")
+                logger.error("[VOICE] Error deleting temp file: %s", e)
         if normalized_file and os.path.exists(normalized_file.name):
             try:
                 os.unlink(normalized_file.name)
             except Exception as e:
-                print(f"[VOICE] Error deleting normalized file: {e}")
+                logger.error("[VOICE] Error deleting normalized file: %s", e)
 
 
 @router.post(
@@ -381,13 +626,14 @@ async def validate_audio_file(
 )
 async def enroll_voice(
     audio_files: List[UploadFile] = File(..., description="3 WAV audio files (16kHz mono)"),
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user_strict),
+    db=Depends(get_db),
 ) -> EnrollVoiceResponse:
     """Enroll user's voice by processing 3 audio recordings.
     
     SECURITY & PRIVACY:
     ===================
-    - Requires authentication (get_current_user dependency)
+    - Requires authentication with a non-revoked token (get_current_user_strict dependency)
     - Embeddings stored with uid as document ID (user-scoped)
     - Audio files deleted immediately after embedding extraction
     - Quality validation prevents poor enrollments
@@ -406,7 +652,8 @@ async def enroll_voice(
     
     STORAGE:
     ========
-    - enrollmentEmbeddings: List of 3 individual embeddings
+    - enrollmentEmbeddingsF32: 3 individual embeddings packed as float32
+      bytes (L2-normalized, flagged by embeddingsNormalized)
     - enrollmentMetadata: Per-embedding metadata with similarities
     - Model versioning info (modelId, revision, version)
     - Legacy voiceEmbedding: Averaged embedding (for backward compatibility)
@@ -422,7 +669,7 @@ async def enroll_voice(
         HTTPException: 400 if invalid files or quality check fails, 401 if unauthorized
     """
     uid = current_user["uid"]
-    temp_files = []
+    work_dir = None
     
     try:
         # Validate exactly 3 files
@@ -441,8 +688,8 @@ async def enroll_voice(
                 )
             
             # Accept both WAV and M4A files (M4A will be normalized to WAV)
-            file_ext = file.filename.lower().split('.')[-1] if '.' in file.filename else ''
-            if file_ext not in ['wav', 'm4a']:
+            file_ext = os.path.splitext(file.filename)[1][1:].lower()
+            if file_ext not in _ALLOWED_AUDIO_EXTENSIONS:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"File {i+1} must be a WAV or M4A file. Got: {file.filename}"
@@ -450,90 +697,63 @@ async def enroll_voice(
             
             # Check content type
             if file.content_type and 'audio' not in file.content_type.lower():
-                print(f"[VOICE] Warning: File {i+1} has unexpected content type: {file.content_type}")
+                logger.warning("[VOICE] Warning: File %s has unexpected content type: %s", i+1, file.content_type)
         
-        print(f"[VOICE] Starting voice enrollment for user {uid}")
+        logger.info("[VOICE] Starting voice enrollment for user %s", uid)
         
         # Get current model metadata
         model_metadata = get_current_model_metadata()
         
         # Save files temporarily, validate quality, and extract embeddings
-        embeddings = []
+        samples = []
         enrollment_metadata_list = []
         registered_at = datetime.now(timezone.utc)
         
+        # One private working directory per enrollment: files get fixed names
+        # inside it and a single rmtree removes them all afterwards
+        work_dir = tempfile.mkdtemp(prefix='voice_enroll_')
+        
         for i, file in enumerate(audio_files):
-            # Create temporary file (preserve original extension for M4A files)
+            # Preserve original extension for M4A files (format detection)
             file_extension = os.path.splitext(file.filename or 'audio.wav')[1] or '.wav'
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_extension)
-            temp_files.append(temp_file.name)
+            upload_path = os.path.join(work_dir, f"upload_{i}{file_extension}")
             
-            # Read and save file content
-            content = await file.read()
-            if len(content) == 0:
+            # Stream file content to disk
+            with open(upload_path, 'wb') as temp_file:
+                size, header = await _save_upload(file, temp_file)
+            if size == 0:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"File {i+1} is empty"
                 )
-            
-            temp_file.write(content)
-            temp_file.close()
-            
-            # Normalize audio to 16kHz WAV before validation (handles format conversion)
-            # This allows Android M4A files to be converted to WAV at correct sample rate
-            normalized_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            normalized_file.close()
-            temp_files.append(normalized_file.name)  # Track for cleanup
-            
-            validation_file = temp_file.name
-            try:
-                from app.services.audio_service import normalize_audio
-                normalize_audio(temp_file.name, normalized_file.name)
-                validation_file = normalized_file.name
-                print(f"[VOICE] Normalized file {i+1} from {file_extension} to WAV at 16kHz")
-            except Exception as normalize_error:
-                # If normalization fails, try validating original file
-                print(f"[VOICE] Normalization failed for file {i+1}, using original file: {normalize_error}")
-                validation_file = temp_file.name
-            
-            # Validate audio quality BEFORE extracting embedding or storing
-            print(f"[VOICE] Validating audio quality for file {i+1}/{len(audio_files)}")
-            quality_result = validate_audio_quality(validation_file)
-            
-            if quality_result.status == "FAIL":
-                # Build detailed error message
-                error_detail = f"File {i+1} failed quality validation: {quality_result.message}"
-                if quality_result.reasons:
-                    error_detail += f" (Reasons: {', '.join(quality_result.reasons)})"
-                
+            # Reject malformed uploads before any decoding work
+            if not _is_supported_audio_header(header):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=error_detail
+                    detail=f"File {i+1} is not a valid WAV or M4A recording"
                 )
             
-            # Store quality metrics for passed recordings (for audit/debugging)
-            print(f"[VOICE] File {i+1} passed quality validation: duration={quality_result.metrics.get('durationSeconds', 0):.1f}s, silence={quality_result.metrics.get('silenceRatio', 0)*100:.1f}%, RMS={quality_result.metrics.get('rms', 0):.0f}, clipping={quality_result.metrics.get('clippingRatio', 0)*100:.1f}%")
-            
-            # Extract embedding (use normalized file if available, otherwise original)
-            print(f"[VOICE] Extracting embedding from file {i+1}/{len(audio_files)}")
-            try:
-                embedding = extract_speaker_embedding(validation_file)
-                embeddings.append(embedding)
-                print(f"[VOICE] Extracted embedding {i+1} (dimension: {len(embedding)})")
-            except Exception as e:
-                error_message = str(e)
-                print(f"[VOICE] Error extracting embedding from file {i+1}: {error_message}")
-                
-                # Provide user-friendly error messages
-                if "too short" in error_message.lower():
-                    user_message = f"Recording {i+1} is too short for voice analysis. Please record for longer."
-                else:
-                    user_message = f"Failed to process recording {i+1}. Please try recording again."
-                
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=user_message
-                )
+            normalized_path = os.path.join(work_dir, f"normalized_{i}.wav")
+            samples.append((upload_path, normalized_path, file_extension))
+        
+        # Normalize, validate and embed all recordings concurrently in worker
+        # processes, so latency is the slowest recording rather than the sum,
+        # the CPU work spreads across cores and the event loop is never blocked
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(enrollment_executor, prepare_enrollment_sample, i, len(audio_files), *sample)
+                for i, sample in enumerate(samples)
+            ],
+            return_exceptions=True,
+        )
+        # Report the first failing recording (in upload order)
+        for result in results:
+            if isinstance(result, EnrollmentSampleError):
+                raise HTTPException(status_code=result.status_code, detail=result.detail)
+            if isinstance(result, BaseException):
+                raise result
+        embeddings = list(results)
         
         # Validate embeddings
         if len(embeddings) == 0:
@@ -552,50 +772,54 @@ async def enroll_voice(
                 )
         
         # Compute similarity between enrollment embeddings (for quality check)
-        print(f"[VOICE] Computing inter-enrollment similarities for quality check")
-        for i, emb1 in enumerate(embeddings):
-            similarities_to_others = []
-            for j, emb2 in enumerate(embeddings):
-                if i != j:
-                    sim = cosine_similarity(emb1, emb2)
-                    similarities_to_others.append(sim)
-            
+        # in one batched kernel call (SIMD via simsimd when installed)
+        logger.info("[VOICE] Computing inter-enrollment similarities for quality check")
+        embedding_matrix = np.asarray(embeddings, dtype=np.float32)
+        similarity_matrix = cosine_similarity_matrix(embedding_matrix, embedding_matrix)
+        # L2-normalized rows are what gets stored
+        norms = np.linalg.norm(embedding_matrix, axis=1, keepdims=True)
+        unit_matrix = np.divide(embedding_matrix, norms, out=np.zeros_like(embedding_matrix), where=norms > 0)
+        off_diagonal = ~np.eye(len(embeddings), dtype=bool)
+        
+        for i in range(len(embeddings)):
             # Create enrollment metadata
             enrollment_metadata_list.append({
                 'index': i,
                 'extractedAt': registered_at,
-                'similarityToOthers': similarities_to_others,
+                'similarityToOthers': similarity_matrix[i, off_diagonal[i]].tolist(),
             })
         
         # Store individual embeddings (NOT averaged) in Firestore
-        db = get_firestore_db()
-        doc_ref = db.collection('voice_profiles').document(uid)
+        doc_ref = _voice_profiles_collection(db).document(uid)
         
-        # Get or create profile
-        doc = doc_ref.get()
-        if doc.exists:
-            existing_data = doc.to_dict()
-        else:
-            existing_data = {}
-        
-        # Convert embeddings to plain Python lists of floats
-        # Firestore does NOT support nested arrays (list of lists).
-        # We must store them as a map (dictionary) where keys are indices.
-        enrollment_embeddings_map = {}
-        for idx, emb in enumerate(embeddings):
-            if isinstance(emb, np.ndarray):
-                emb = emb.tolist()
-            # Ensure every element is a plain Python float
-            emb_plain = [float(x) for x in emb]
-            enrollment_embeddings_map[str(idx)] = emb_plain
+        # set(merge=True) below keeps every field we don't write, so the
+        # existing profile is only needed for the createdAt/sampleText
+        # defaults; read just those two fields
+        doc = await doc_ref.get(field_paths=['createdAt', 'sampleText'])
+        existing_data = doc.to_dict() or {} if doc.exists else {}
+        
+        # Legacy averaged embedding, re-normalized to unit length
+        mean_embedding = unit_matrix.mean(axis=0)
+        mean_norm = np.linalg.norm(mean_embedding)
+        if mean_norm > 0:
+            mean_embedding = mean_embedding / mean_norm
         
         # Merge all data into a single dict for a single set() operation
         profile_data = {
-            **existing_data,  # Preserve existing fields
             'uid': uid,
-            # Store embeddings as a map/dictionary to avoid "Nested arrays not allowed" error
-            'enrollmentEmbeddings': enrollment_embeddings_map,
+            # Store unit-length embeddings (cosine similarity is unchanged by
+            # normalization) as one packed float32 blob; Firestore does not
+            # support nested arrays and per-float lists box every value.
+            'enrollmentEmbeddingsF32': encode_embeddings(unit_matrix),
+            # Superseded by enrollmentEmbeddingsF32
+            'enrollmentEmbeddings': firestore.DELETE_FIELD,
             'enrollmentMetadata': enrollment_metadata_list,
+            # Marks the stored embeddings/voiceEmbedding as unit vectors
+            # (profiles enrolled before this flag store raw embeddings)
+            'embeddingsNormalized': True,
+            # Compact int8 copy (bytes) used by /voice/verify
+            'enrollmentEmbeddingsI8': encode_quantized_embeddings(unit_matrix),
+            'quantized': True,
             
             # Model versioning
             'model': model_metadata.model_id,
@@ -603,7 +827,7 @@ async def enroll_voice(
             'modelVersion': model_metadata.internal_version,
             
             # Legacy field (for backward compatibility) - compute average
-            'voiceEmbedding': [float(x) for x in np.mean(embeddings, axis=0).tolist()],
+            'voiceEmbedding': mean_embedding.tolist(),
             
             'registeredAt': registered_at,
             'status': 'READY',
@@ -612,15 +836,17 @@ async def enroll_voice(
         }
         
         # Ensure createdAt and sampleText exist
-        if 'createdAt' not in profile_data:
-            profile_data['createdAt'] = registered_at
-        if 'sampleText' not in profile_data:
+        if 'createdAt' not in existing_data:
+            profile_data['createdAt'] = firestore.SERVER_TIMESTAMP
+        if 'sampleText' not in existing_data:
             profile_data['sampleText'] = get_random_sample_text()
         
-        # Single set() operation with merge=True
-        doc_ref.set(profile_data, merge=True)
+        # Single set() operation with merge=True (existing fields are preserved)
+        await doc_ref.set(profile_data, merge=True)
+        _profile_cache.pop(uid, None)
+        _enrollment_cache.pop(uid, None)
         
-        print(f"[VOICE] Successfully enrolled voice for user {uid} with {len(embeddings)} individual embeddings")
+        logger.info("[VOICE] Successfully enrolled voice for user %s with %s individual embeddings", uid, len(embeddings))
         
         return EnrollVoiceResponse(
             success=True,
@@ -631,20 +857,19 @@ async def enroll_voice(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[VOICE] Error enrolling voice: {e}")
+        logger.exception("[VOICE] Error enrolling voice: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to enroll voice: {str(e)}"
         )
     finally:
         # Clean up temporary files
-        for temp_file_path in temp_files:
+        if work_dir:
             try:
-                if os.path.exists(temp_file_path):
-                    os.remove(temp_file_path)
-                    print(f"[VOICE] Deleted temporary file: {temp_file_path}")
+                shutil.rmtree(work_dir)
+                logger.debug("[VOICE] Deleted temporary directory: %s", work_dir)
             except Exception as e:
-                print(f"[VOICE] Warning: Could not delete temporary file {temp_file_path}: {e}")
+                logger.warning("[VOICE] Warning: Could not delete temporary directory %s: %s", work_dir, e)
 
 
 @router.post(
@@ -664,9 +889,10 @@ async def enroll_voice(
         },
     },
 )
-def verify_voice(
+async def verify_voice(
     request: VoiceVerificationRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db=Depends(get_db),
 ) -> VoiceVerificationResponse:
     """Verify if session audio matches the registered user's voice.
     
@@ -700,13 +926,13 @@ def verify_voice(
     Raises:
         HTTPException: 404 if user has not enrolled voice
     """
-    try:
-        uid = current_user["uid"]
-        db = get_firestore_db()
-        
-        # Get user's voice profile
-        doc_ref = db.collection('voice_profiles').document(uid)
-        doc = doc_ref.get()
+    uid = current_user["uid"]
+    
+    cached = _enrollment_cache.get(uid)
+    if cached is None:
+        # Get user's voice profile (embedding fields only)
+        doc_ref = _voice_profiles_collection(db).document(uid)
+        doc = await doc_ref.get(field_paths=_VERIFY_FIELDS)
         
         if not doc.exists:
             raise HTTPException(
@@ -716,67 +942,51 @@ def verify_voice(
         
         profile_data = doc.to_dict()
         
-        # Get enrollment embeddings (prefer new format, fallback to legacy)
-        enrollment_embeddings_raw = profile_data.get('enrollmentEmbeddings')
-        
-        # Handle dictionary format (Firestore map) - convert to list of lists
-        if isinstance(enrollment_embeddings_raw, dict):
-            # Sort by key (index) to maintain order - handle numeric string keys
-            sorted_keys = sorted(enrollment_embeddings_raw.keys(), key=lambda x: int(x) if x.isdigit() else 0)
-            enrollment_embeddings = []
-            for k in sorted_keys:
-                emb_value = enrollment_embeddings_raw[k]
-                # Ensure it's a list
-                if isinstance(emb_value, list):
-                    enrollment_embeddings.append(emb_value)
-                else:
-                    # Try to convert if it's array-like
-                    if hasattr(emb_value, '__iter__') and not isinstance(emb_value, str):
-                        enrollment_embeddings.append(list(emb_value))
-                    else:
-                        raise ValueError(f"Invalid embedding format at key '{k}': expected list, got {type(emb_value)}")
+        # Prefer the int8 copy; profiles enrolled before it existed fall
+        # back to the float embeddings
+        quantized_embeddings = None
+        if profile_data.get('quantized'):
+            quantized_embeddings = decode_quantized_embeddings(profile_data.get('enrollmentEmbeddingsI8'))
+        
+        if quantized_embeddings is not None:
+            cached = (quantized_embeddings, True, True)
         else:
-            enrollment_embeddings = enrollment_embeddings_raw
-            
-        if not enrollment_embeddings:
-            # Fallback to legacy single embedding
-            stored_embedding = profile_data.get('voiceEmbedding')
-            if not stored_embedding:
+            # Get enrollment embeddings as one float32 matrix (handles the
+            # packed, map and legacy single-embedding formats)
+            enrollment_embeddings = load_enrollment_embeddings(profile_data)
+            if enrollment_embeddings is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Voice embedding not found. Please re-enroll your voice."
                 )
-            # Convert legacy single embedding to list format
-            enrollment_embeddings = [stored_embedding]
-        
-        # Use verification service (handles multi-embedding comparison and dynamic thresholds)
-        decision, warning = verify_speaker(
-            request.sessionAudioEmbedding,
-            enrollment_embeddings,
-            environment=None,  # Will use default environment
-            uid=uid
-        )
-        
-        if warning:
-            print(f"[VOICE] Verification warning for user {uid}: {warning}")
-        
-        print(f"[VOICE] Verification for user {uid}: {decision.decision} (internal={decision.internalState}, max_sim={decision.maxSimilarity:.3f}, topK_mean={decision.topKMean:.3f})")
-        
-        # Return verification result (v1: binary decision)
-        return VoiceVerificationResponse(
-            result=decision.decision,  # User-facing: OWNER or OTHER
-            score=decision.maxSimilarity if decision.maxSimilarity > 0 else None,
-            internalState=decision.internalState  # Internal state for logging
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"[VOICE] Error verifying voice: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to verify voice: {str(e)}"
-        )
+            cached = (enrollment_embeddings, bool(profile_data.get('embeddingsNormalized')), False)
+        _enrollment_cache[uid] = cached
+    
+    enrollment_matrix, enrollment_normalized, enrollment_quantized = cached
+    
+    # Use verification service (handles multi-embedding comparison and dynamic thresholds).
+    # It reads thresholds and logs scores with the sync client, so run it off the event loop.
+    decision, warning = await asyncio.to_thread(
+        verify_speaker,
+        request.sessionAudioEmbedding,
+        enrollment_matrix,
+        environment=None,  # Will use default environment
+        uid=uid,
+        enrollment_normalized=enrollment_normalized,
+        enrollment_quantized=enrollment_quantized,
+    )
+    
+    if warning:
+        logger.warning("[VOICE] Verification warning for user %s: %s", uid, warning)
+    
+    logger.info("[VOICE] Verification for user %s: %s (internal=%s, max_sim=%.3f, topK_mean=%.3f)", uid, decision.decision, decision.internalState, decision.maxSimilarity, decision.topKMean)
+    
+    # Return verification result (v1: binary decision)
+    return VoiceVerificationResponse.model_construct(
+        result=decision.decision,  # User-facing: OWNER or OTHER
+        score=decision.maxSimilarity if decision.maxSimilarity > 0 else None,
+        internalState=decision.internalState  # Internal state for logging
+    )
 
 
 @router.get(
@@ -793,8 +1003,9 @@ def verify_voice(
         },
     },
 )
-def get_voice_status(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+async def get_voice_status(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db=Depends(get_db),
 ) -> VoiceStatusResponse:
     """Get voice registration status for the current user.
     
@@ -806,14 +1017,13 @@ def get_voice_status(
     """
     try:
         uid = current_user["uid"]
-        db = get_firestore_db()
         
-        # Get voice profile
-        doc_ref = db.collection('voice_profiles').document(uid)
-        doc = doc_ref.get()
+        # Get voice profile (status fields only)
+        doc_ref = _voice_profiles_collection(db).document(uid)
+        doc = await doc_ref.get(field_paths=_STATUS_FIELDS)
         
         if not doc.exists:
-            return VoiceStatusResponse(
+            return VoiceStatusResponse.model_construct(
                 isRegistered=False,
                 registeredAt=None,
                 model=None
@@ -823,29 +1033,25 @@ def get_voice_status(
         voice_embedding = profile_data.get('voiceEmbedding')
         
         if not voice_embedding:
-            return VoiceStatusResponse(
+            return VoiceStatusResponse.model_construct(
                 isRegistered=False,
                 registeredAt=None,
                 model=None
             )
         
         # Convert registeredAt timestamp
-        registered_at = None
-        if 'registeredAt' in profile_data and profile_data['registeredAt']:
-            reg_at = profile_data['registeredAt']
-            if hasattr(reg_at, 'timestamp'):
-                registered_at = datetime.fromtimestamp(reg_at.timestamp(), tz=timezone.utc)
+        registered_at = to_utc(profile_data.get('registeredAt'))
         
-        return VoiceStatusResponse(
+        return VoiceStatusResponse.model_construct(
             isRegistered=True,
             registeredAt=registered_at,
             model=profile_data.get('model', 'speechbrain/spkrec-ecapa-voxceleb')
         )
         
     except Exception as e:
-        print(f"[VOICE] Error getting voice status: {e}")
+        logger.exception("[VOICE] Error getting voice status: %s", e)
         # Return not registered on error
-        return VoiceStatusResponse(
+        return VoiceStatusResponse.model_construct(
             isRegistered=False,
             registeredAt=None,
             model=None
@@ -868,8 +1074,9 @@ def get_voice_status(
         },
     },
 )
-def delete_voice_profile(
-    current_user: Dict[str, Any] = Depends(get_current_user)
+async def delete_voice_profile(
+    current_user: Dict[str, Any] = Depends(get_current_user_strict),
+    db=Depends(get_db),
 ) -> Dict[str, Any]:
     """Delete the user's voice profile.
     
@@ -885,36 +1092,27 @@ def delete_voice_profile(
     Raises:
         HTTPException: 404 if profile not found
     """
-    try:
-        uid = current_user["uid"]
-        db = get_firestore_db()
-        
-        # Get voice profile
-        doc_ref = db.collection('voice_profiles').document(uid)
-        doc = doc_ref.get()
-        
-        if not doc.exists:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Voice profile not found"
-            )
-        
-        # Delete the document
-        doc_ref.delete()
-        
-        print(f"[VOICE] Deleted voice profile for user {uid}")
-        
-        return {
-            "success": True,
-            "message": "Voice profile deleted successfully"
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"[VOICE] Error deleting voice profile: {e}")
+    uid = current_user["uid"]
+    
+    # Get voice profile
+    doc_ref = _voice_profiles_collection(db).document(uid)
+    doc = await doc_ref.get()
+    
+    if not doc.exists:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete voice profile: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Voice profile not found"
         )
+    
+    # Delete the document
+    await doc_ref.delete()
+    _profile_cache.pop(uid, None)
+    _enrollment_cache.pop(uid, None)
+    
+    logger.info("[VOICE] Deleted voice profile for user %s", uid)
+    
+    return {
+        "success": True,
+        "message": "Voice profile deleted successfully"
+    }
 
@@ -1,4 +1,10 @@
+import hashlib
+import logging
+import os
+import threading
+import time
 from typing import Dict, Any
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from firebase_admin.auth import (
@@ -10,9 +16,36 @@ from firebase_admin.auth import (
 )
 
 from app.auth.firebase import get_firebase_auth
+from app.auth import jwt_verifier
 
 security = HTTPBearer()
 
+logger = logging.getLogger(__name__)
+
+# Verified tokens, keyed by a digest of the bearer token (the raw token is
+# never stored). Entries live at most 5 minutes and never past the token's
+# own expiry, so a cache hit skips the signature verification entirely.
+# Set AUTH_TOKEN_CACHE=0 to verify every request.
+TOKEN_CACHE_ENABLED = os.getenv("AUTH_TOKEN_CACHE", "1") != "0"
+_TOKEN_EXPIRY_MARGIN_SECONDS = 30
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+_token_cache_lock = threading.Lock()
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _get_cached_user(key: bytes):
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+    if entry is None:
+        return None
+    user, exp = entry
+    if exp <= time.time() + _TOKEN_EXPIRY_MARGIN_SECONDS:
+        return None
+    return user
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
@@ -50,30 +83,64 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get Firebase Auth service for token validation
-    auth_service = get_firebase_auth()
+    if not TOKEN_CACHE_ENABLED:
+        return _verify_token(token, check_revoked=False)[0]
+    
+    cache_key = _token_cache_key(token)
+    cached_user = _get_cached_user(cache_key)
+    if cached_user is not None:
+        return cached_user
+    
+    user, exp = _verify_token(token, check_revoked=False)
+    with _token_cache_lock:
+        _token_cache[cache_key] = (user, exp)
+    return user
+
+
+def get_current_user_strict(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, Any]:
+    """Like get_current_user, but also checks whether the token was revoked.
+    
+    The revocation check is a network call to Firebase on every request, and
+    its result is never cached. Use this only on sensitive endpoints; regular
+    endpoints use get_current_user, where revocation is enforced at sign-in
+    and by the token's one-hour lifetime.
+    """
+    token = credentials.credentials
     
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Authentication token is required",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    return _verify_token(token, check_revoked=True)[0]
+
+
+def _verify_token(token: str, check_revoked: bool):
+    """Verify an ID token, returning (normalized user, exp) or raising HTTPException."""
     try:
-        # Log token info for debugging (first 20 chars only for security)
-        print(f"[AUTH] Verifying token (length: {len(token)}, prefix: {token[:20]}...)")
-        
-        # Validate the identity token
-        # Using check_revoked=False to avoid certificate fetching issues on cloud platforms
-        # This still validates the token signature and expiration
-        decoded_token = auth_service.verify_id_token(token, check_revoked=False)
-        
-        print(f"[AUTH] Token verified successfully for uid: {decoded_token.get('uid')}")
+        # Validate the identity token (signature, expiration, audience, issuer).
+        # Without a revocation check this is a local PyJWT verify against the
+        # cached Google JWKS; the revocation check needs the Admin SDK.
+        if check_revoked:
+            decoded_token = get_firebase_auth().verify_id_token(token, check_revoked=True)
+        else:
+            decoded_token = jwt_verifier.verify_id_token(token)
         
         # Return normalized user object
-        return {
+        user = {
             "uid": decoded_token["uid"],
             "email": decoded_token.get("email"),
             "email_verified": decoded_token.get("email_verified", False),
             "name": decoded_token.get("name"),
         }
+        return user, decoded_token.get("exp", 0)
         
     except (InvalidIdTokenError, ExpiredIdTokenError) as e:
-        print(f"[AUTH] Token validation failed: {type(e).__name__}: {str(e)}")
+        logger.info("[AUTH] Token validation failed: %s: %s", type(e).__name__, e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired authentication token",
@@ -101,7 +168,7 @@ def get_current_user(
         ) from e
         
     except ValueError as e:
-        print(f"[AUTH] Token format error: {str(e)}")
+        logger.info("[AUTH] Token format error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication token format",
@@ -110,9 +177,7 @@ def get_current_user(
         
     except Exception as e:
         # Catch any other unexpected errors
-        print(f"[AUTH] Unexpected error during token validation: {type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[AUTH] Unexpected error during token validation: %s", type(e).__name__)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Authentication failed: {str(e)}",
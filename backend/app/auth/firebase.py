@@ -44,7 +44,7 @@ if not firebase_admin._apps:
     if not missing_fields:
         # Use credentials from environment variables
         cred = credentials.Certificate(firebase_credentials)
-        firebase_admin.initialize_app(cred)
+        _firebase_app = firebase_admin.initialize_app(cred)
     else:
         # Fallback to file path if environment variables are not set
         service_account_path = os.getenv("FIREBASE_CREDENTIALS")
@@ -61,7 +61,7 @@ if not firebase_admin._apps:
             # Verify the file exists
             if os.path.exists(service_account_path):
                 cred = credentials.Certificate(service_account_path) 
-                firebase_admin.initialize_app(cred)
+                _firebase_app = firebase_admin.initialize_app(cred)
             else:
                 raise FileNotFoundError(
                     f"Firebase service account file not found: {service_account_path}. "
@@ -72,6 +72,18 @@ if not firebase_admin._apps:
                 f"Firebase credentials are missing. Please set FIREBASE_CREDENTIALS (file path) "
                 f"or set all required FIREBASE_* environment variables. Missing fields: {missing_fields}"
             )
+else:
+    _firebase_app = firebase_admin.get_app()
+
+# Resolved once at import: the initialized app (its credential holds the
+# already-parsed private key) and the project ID, which is the expected
+# audience/issuer of user ID tokens
+FIREBASE_PROJECT_ID = _firebase_app.project_id
+
+
+def get_firebase_app():
+    """Get the initialized Firebase app (a module global, never rebuilt)."""
+    return _firebase_app
 
 
 def get_firebase_auth():
@@ -0,0 +1,74 @@
+"""
+Firebase ID Token Verifier
+
+Verifies Firebase ID tokens with PyJWT against Google's securetoken JWKS,
+instead of firebase_admin.auth.verify_id_token. The signing keys are
+fetched once and cached at module scope, so verification is a local
+RS256 signature check plus claim validation.
+
+Errors are raised as the firebase_admin.auth exception types so callers
+handle both verifiers the same way.
+"""
+import jwt
+from firebase_admin.auth import (
+    InvalidIdTokenError,
+    ExpiredIdTokenError,
+    CertificateFetchError,
+)
+
+from app.auth.firebase import FIREBASE_PROJECT_ID
+
+JWKS_URL = "https://www.googleapis.com/service_accounts/v1/jwk/securetoken@system.gserviceaccount.com"
+
+# Google rotates these keys every few days; re-fetch the set at most every 6 hours
+_JWKS_CACHE_SECONDS = 6 * 60 * 60
+
+_jwks_client = jwt.PyJWKClient(
+    JWKS_URL,
+    cache_keys=True,
+    max_cached_keys=16,
+    lifespan=_JWKS_CACHE_SECONDS,
+    timeout=10,
+)
+_issuer = f"https://securetoken.google.com/{FIREBASE_PROJECT_ID}"
+
+
+def verify_id_token(token: str) -> dict:
+    """Verify a Firebase ID token and return its decoded claims.
+
+    Checks the RS256 signature, exp/iat, audience (project ID), issuer and
+    a non-empty subject. Adds "uid" (= sub) like firebase_admin does.
+
+    Args:
+        token: Firebase ID token (JWT)
+
+    Returns:
+        dict: Decoded token claims
+
+    Raises:
+        ExpiredIdTokenError: If the token has expired
+        InvalidIdTokenError: If the token is malformed or fails any check
+        CertificateFetchError: If the signing keys cannot be fetched
+    """
+    try:
+        signing_key = _jwks_client.get_signing_key_from_jwt(token).key
+        claims = jwt.decode(
+            token,
+            signing_key,
+            algorithms=["RS256"],
+            audience=FIREBASE_PROJECT_ID,
+            issuer=_issuer,
+            options={"require": ["exp", "iat", "sub"]},
+        )
+    except jwt.ExpiredSignatureError as e:
+        raise ExpiredIdTokenError("Firebase ID token has expired", e) from e
+    except jwt.PyJWKClientConnectionError as e:
+        raise CertificateFetchError(f"Failed to fetch Firebase signing keys: {e}", e) from e
+    except jwt.PyJWTError as e:
+        raise InvalidIdTokenError(f"Invalid Firebase ID token: {e}", e) from e
+
+    if not claims.get("sub") or len(claims["sub"]) > 128:
+        raise InvalidIdTokenError("Firebase ID token has an invalid subject", None)
+
+    claims["uid"] = claims["sub"]
+    return claims
@@ -1,14 +1,46 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import anyio.to_thread
+from fastapi import Depends, FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from dotenv import load_dotenv
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
 import os
+import queue
+import secrets
+from typing import Optional
 import requests
+from requests.adapters import HTTPAdapter
 
 # Load environment variables from .env file
 load_dotenv()
 
+
+def configure_logging():
+    """Send all app.* loggers through a queue drained by a background thread.
+
+    Request handlers only enqueue the record; formatting and the blocking
+    write to stdout happen on the QueueListener thread.
+    """
+    app_logger = logging.getLogger("app")
+    if app_logger.handlers:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s %(name)s %(message)s"))
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    app_logger.propagate = False
+    listener.start()
+    atexit.register(listener.stop)
+
+
+configure_logging()
+
 from app.api.auth import router as auth_router
 from app.api.me import router as me_router
 from app.api.sessions import router as sessions_router
@@ -21,20 +53,46 @@ from app.api.analysis import router as analysis_router
 from app.api.notes import router as notes_router
 from app.api.stats import router as stats_router
 from app.services.cleanup_service import run_cleanup_job
+from app.services import similarity_kernels
+from app.services.enrollment_audio_service import shutdown_enrollment_executor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Bound the sync-endpoint threadpool and warm up JIT-compiled kernels before serving requests.
+
+    On shutdown, stops the enrollment worker processes.
+    """
+    # Sync endpoints and dependencies run under AnyIO's default thread
+    # limiter (40 threads); cap it so bursts queue instead of piling up threads
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(os.getenv("THREADPOOL_SIZE", "16"))
+    similarity_kernels.warm_up()
+    yield
+    shutdown_enrollment_executor()
+
 
 app = FastAPI(
     title="Gossip Detector API",
     description="Backend API for the Gossip Detector application",
     version="1.0.0",
+    lifespan=lifespan,
+    # orjson serializes datetimes (RFC 3339) and dicts natively
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS for cross-origin requests
+# CORS_ORIGINS is a comma-separated allow-list (e.g. "https://app.example.com");
+# unset means any origin, without credentials (wildcard + credentials is
+# invalid CORS). Methods and headers are the ones the API actually uses.
+ALLOWED_ORIGINS = tuple(
+    origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()
+)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
-    allow_methods=["*"],  # Allows all HTTP methods
-    allow_headers=["*"],  # Allows all headers
+    allow_origins=ALLOWED_ORIGINS,
+    allow_credentials="*" not in ALLOWED_ORIGINS,
+    allow_methods=("GET", "POST", "PUT", "DELETE", "OPTIONS"),
+    allow_headers=("Authorization", "Content-Type", "If-None-Match"),
 )
 
 # Register API routers
@@ -55,12 +113,19 @@ app.include_router(stats_router, prefix="/api")
 async def http_exception_handler(request, exc: StarletteHTTPException):
     """Add X-Upload-Retry: false on 403 so clients stop retrying forbidden uploads."""
     if exc.status_code == 403:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=403,
             content={"detail": exc.detail},
             headers={"X-Upload-Retry": "false"},
         )
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+    return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request, exc: Exception):
+    """Log any exception an endpoint let escape and return a generic 500."""
+    logging.getLogger("app").exception("Unhandled error on %s %s", request.method, request.url.path)
+    return ORJSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
 @app.get(
@@ -84,38 +149,54 @@ def health_check():
 def root():
     return {"status": "ok", "service": "Sayly backend"}
 
-@app.get("/debug/env-check")
-def env_check():
-    """Debug endpoint to check if environment variables are loaded (without exposing sensitive data)."""
-    hf_key = os.getenv("HF_API_KEY")
-    return {
-        "HF_API_KEY_set": bool(hf_key),
-        "HF_API_KEY_preview": hf_key[:10] + "..." if hf_key else None,
-        "HF_API_KEY_length": len(hf_key) if hf_key else 0,
-    }
+# Debug endpoints are only registered when ENV is explicitly dev or staging;
+# an unset ENV is treated as production
+DEBUG_ENDPOINTS_ENABLED = os.getenv("ENV") in ("dev", "staging")
 
-
-@app.get("/debug/hf-whoami")
-def hf_whoami():
-    """Debug endpoint to verify the Hugging Face token is valid (does not call inference)."""
-    hf_key = os.getenv("HF_API_KEY")
-    if not hf_key:
-        return {"ok": False, "error": "HF_API_KEY is not set"}
-
-    try:
-        r = requests.get(
-            "https://huggingface.co/api/whoami-v2",
-            headers={"Authorization": f"Bearer {hf_key}", "Accept": "application/json"},
-            timeout=15,
-        )
+if DEBUG_ENDPOINTS_ENABLED:
+    @app.get("/debug/env-check")
+    def env_check():
+        """Debug endpoint to check if environment variables are loaded (without exposing sensitive data)."""
+        hf_key = os.getenv("HF_API_KEY")
         return {
-            "ok": r.status_code == 200,
-            "status": r.status_code,
-            "contentType": r.headers.get("content-type"),
-            "bodyPreview": (r.text or "")[:300],
+            "HF_API_KEY_set": bool(hf_key),
+            "HF_API_KEY_preview": hf_key[:10] + "..." if hf_key else None,
+            "HF_API_KEY_length": len(hf_key) if hf_key else 0,
         }
-    except Exception as e:
-        return {"ok": False, "error": str(e)}
+
+    # Pooled keep-alive connections for Hugging Face calls (no TCP/TLS
+    # handshake per request after the first)
+    _hf_session = requests.Session()
+    _hf_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+    @app.get("/debug/hf-whoami")
+    def hf_whoami():
+        """Debug endpoint to verify the Hugging Face token is valid (does not call inference)."""
+        hf_key = os.getenv("HF_API_KEY")
+        if not hf_key:
+            return {"ok": False, "error": "HF_API_KEY is not set"}
+
+        try:
+            r = _hf_session.get(
+                "https://huggingface.co/api/whoami-v2",
+                headers={"Authorization": f"Bearer {hf_key}", "Accept": "application/json"},
+                timeout=15,
+            )
+            return {
+                "ok": r.status_code == 200,
+                "status": r.status_code,
+                "contentType": r.headers.get("content-type"),
+                "bodyPreview": (r.text or "")[:300],
+            }
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+
+def require_admin_key(x_admin_key: Optional[str] = Header(None)) -> None:
+    """Reject admin requests without the ADMIN_API_KEY value in X-Admin-Key."""
+    admin_key = os.getenv("ADMIN_API_KEY")
+    if not admin_key or not x_admin_key or not secrets.compare_digest(x_admin_key, admin_key):
+        raise HTTPException(status_code=403, detail="Admin key required")
 
 
 @app.post(
@@ -123,6 +204,7 @@ def hf_whoami():
     tags=["admin"],
     summary="Run cleanup job",
     description="Manually trigger cleanup of old audio files and failed sessions. Typically run as a scheduled job.",
+    dependencies=[Depends(require_admin_key)],
 )
 def cleanup_endpoint():
     """Manually trigger cleanup job.
@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SpeechCategoryDistribution(BaseModel):
+    """Speech category distribution percentages.
+
+    Shared by the weekly, monthly, lifetime and progress responses, so
+    pydantic builds one validator/serializer for this shape.
+    """
+    # Every field is always present in responses; say so in the OpenAPI schema
+    model_config = ConfigDict(json_schema_serialization_defaults_required=True)
+
+    gossip: float = Field(0.0, description="Percentage of gossip speech")
+    unethical: float = Field(0.0, description="Percentage of unethical speech")
+    waste: float = Field(0.0, description="Percentage of waste speech")
+    productive: float = Field(0.0, description="Percentage of productive speech")
@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+from app.models.weekly_stats import WeeklyStatsResponse
+from app.models.monthly_stats import MonthlyStatsResponse
+from app.models.lifetime_stats import LifetimeStatsResponse
+
+
+class CombinedStatsResponse(BaseModel):
+    """Response model for the combined weekly/monthly/lifetime statistics."""
+    weekly: WeeklyStatsResponse = Field(..., description="Statistics for the current week")
+    monthly: MonthlyStatsResponse = Field(..., description="Statistics for the selected month")
+    lifetime: LifetimeStatsResponse = Field(..., description="Statistics since account creation")
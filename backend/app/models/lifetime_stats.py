@@ -1,9 +1,13 @@
 from typing import List, Optional
 from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
 from datetime import datetime
 
+from app.models.category import SpeechCategoryDistribution
 
-class MonthlyAverage(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class MonthlyAverage:
     """Monthly average statistics."""
     year: int = Field(..., description="Year")
     month: int = Field(..., description="Month (1-12)")
@@ -13,12 +17,7 @@ class MonthlyAverage(BaseModel):
     total_minutes: float = Field(..., description="Total listening minutes in this month")
 
 
-class LifetimeCategoryDistribution(BaseModel):
-    """Category distribution for lifetime."""
-    gossip: float = Field(0.0, description="Percentage of gossip speech")
-    unethical: float = Field(0.0, description="Percentage of unethical speech")
-    waste: float = Field(0.0, description="Percentage of waste speech")
-    productive: float = Field(0.0, description="Percentage of productive speech")
+LifetimeCategoryDistribution = SpeechCategoryDistribution
 
 
 class LifetimeStatsResponse(BaseModel):
@@ -35,3 +34,18 @@ class LifetimeStatsResponse(BaseModel):
     account_created_at: datetime = Field(..., description="Account creation date")
     first_session_date: Optional[datetime] = Field(None, description="Date of first session")
 
+
+class MonthlyAveragesColumnar(BaseModel):
+    """Monthly averages as parallel arrays (index i of every list is one month)."""
+    years: List[int] = Field(..., description="Year of each month")
+    months: List[int] = Field(..., description="Month (1-12)")
+    month_names: List[str] = Field(..., description="Month name (e.g., 'January 2024')")
+    average_minutes_per_day: List[float] = Field(..., description="Average listening minutes per day in each month")
+    total_sessions: List[int] = Field(..., description="Total sessions in each month")
+    total_minutes: List[float] = Field(..., description="Total listening minutes in each month")
+
+
+class LifetimeStatsColumnarResponse(LifetimeStatsResponse):
+    """Lifetime statistics with the monthly average series in columnar form."""
+    monthly_average_series: MonthlyAveragesColumnar = Field(..., description="Monthly averages since signup")
+
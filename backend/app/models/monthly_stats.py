@@ -1,21 +1,20 @@
 from typing import List, Optional
 from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
 from datetime import datetime
 
+from app.models.category import SpeechCategoryDistribution
 
-class PerDayTotal(BaseModel):
+
+@dataclass(slots=True, frozen=True)
+class PerDayTotal:
     """Daily totals for a specific date in the month."""
     date: str = Field(..., description="Date in YYYY-MM-DD format")
     minutes: float = Field(..., description="Total listening minutes for this day")
     sessions: int = Field(..., description="Total number of sessions for this day")
 
 
-class MonthlyCategoryDistribution(BaseModel):
-    """Category distribution for the month."""
-    gossip: float = Field(0.0, description="Percentage of gossip speech")
-    unethical: float = Field(0.0, description="Percentage of unethical speech")
-    waste: float = Field(0.0, description="Percentage of waste speech")
-    productive: float = Field(0.0, description="Percentage of productive speech")
+MonthlyCategoryDistribution = SpeechCategoryDistribution
 
 
 class MonthlyStatsResponse(BaseModel):
@@ -1,14 +1,12 @@
 from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
 from datetime import datetime
 
+from app.models.category import SpeechCategoryDistribution
 
-class CategoryDistribution(BaseModel):
-    """Category distribution percentages."""
-    gossip: float = Field(..., description="Gossip percentage")
-    unethical: float = Field(..., description="Unethical speech percentage")
-    waste: float = Field(..., description="Wasteful talk percentage")
-    productive: float = Field(..., description="Productive speech percentage")
+
+CategoryDistribution = SpeechCategoryDistribution
 
 
 class ProgressReportResponse(BaseModel):
@@ -25,7 +23,8 @@ class ProgressReportResponse(BaseModel):
     categoryDistribution: Optional[CategoryDistribution] = Field(None, description="Speech category distribution percentages")
 
 
-class ChartDataPoint(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ChartDataPoint:
     """A single data point for chart visualization."""
     timestamp: datetime = Field(..., description="Timestamp for this data point")
     minutes: float = Field(..., description="Listening minutes for this time period")
@@ -36,3 +35,13 @@ class ChartDataResponse(BaseModel):
     period: Literal["today", "week", "month", "lifetime"] = Field(..., description="The time period for this chart")
     points: List[ChartDataPoint] = Field(..., description="Time series data points for the chart")
 
+
+class ChartDataColumnarResponse(BaseModel):
+    """Chart data as parallel arrays (timestamps[i] pairs with minutes[i]).
+
+    Timestamps are Unix epoch seconds rather than ISO-8601 strings.
+    """
+    period: Literal["today", "week", "month", "lifetime"] = Field(..., description="The time period for this chart")
+    timestamps: List[int] = Field(..., description="Timestamp of each data point (Unix epoch seconds, UTC)")
+    minutes: List[float] = Field(..., description="Listening minutes of each data point")
+
@@ -1,8 +1,24 @@
 from typing import Optional, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
 from datetime import datetime
 
 
+# Allowed values, defined once and shared by every model below
+SessionStatus = Literal["ACTIVE", "STOPPED"]
+Device = Literal["ios", "android", "unknown"]
+AnalysisStatus = Literal["PENDING", "PROCESSING", "COMPLETED", "FAILED"]
+
+
+class SessionTotals(BaseModel):
+    """Per-session statistics (fixed shape, so validation is three int slots)."""
+    model_config = ConfigDict(frozen=True)
+
+    totalSeconds: int = Field(0, description="Total duration in seconds")
+    flaggedCount: int = Field(0, description="Number of flagged interactions")
+    positiveCount: int = Field(0, description="Number of positive interactions")
+
+
 class ListeningSession(BaseModel):
     """Model representing a listening session.
     
@@ -13,21 +29,14 @@ class ListeningSession(BaseModel):
     uid: str = Field(..., description="User ID who owns this session")
     startedAt: datetime = Field(..., description="When the session started")
     endedAt: Optional[datetime] = Field(None, description="When the session ended (null if active)")
-    status: Literal["ACTIVE", "STOPPED"] = Field(..., description="Current status of the session")
-    device: Literal["ios", "android", "unknown"] = Field(..., description="Device type")
-    totals: dict = Field(
-        default_factory=lambda: {
-            "totalSeconds": 0,
-            "flaggedCount": 0,
-            "positiveCount": 0,
-        },
-        description="Session statistics"
-    )
+    status: SessionStatus = Field(..., description="Current status of the session")
+    device: Device = Field(..., description="Device type")
+    totals: SessionTotals = Field(default_factory=SessionTotals, description="Session statistics")
     note: Optional[str] = Field(None, description="User's reflection note for this session")
     updatedAt: Optional[datetime] = Field(None, description="When the note was last updated")
     audioUrl: Optional[str] = Field(None, description="URL/path to the audio file for this session")
     audioProcessed: bool = Field(False, description="Whether the audio has been processed")
-    analysisStatus: Literal["PENDING", "PROCESSING", "COMPLETED", "FAILED"] = Field(
+    analysisStatus: AnalysisStatus = Field(
         "PENDING",
         description="Status of AI analysis for this session"
     )
@@ -45,7 +54,7 @@ class ListeningSession(BaseModel):
 
 class StartSessionRequest(BaseModel):
     """Request model for starting a session."""
-    device: Literal["ios", "android", "unknown"] = Field(
+    device: Device = Field(
         default="unknown",
         description="Device type"
     )
@@ -72,7 +81,8 @@ class LastSessionResponse(BaseModel):
     session: Optional[ListeningSession] = Field(None, description="The most recent session, or null if none exists")
 
 
-class SessionSummary(BaseModel):
+@dataclass(slots=True, frozen=True)
+class SessionSummary:
     """Summary model for listing sessions (without full details)."""
     id: str = Field(..., description="Session identifier")
     startedAt: datetime = Field(..., description="When the session started")
@@ -80,8 +90,8 @@ class SessionSummary(BaseModel):
     totalSeconds: int = Field(..., description="Total duration in seconds")
     flaggedCount: int = Field(..., description="Number of flagged interactions")
     positiveCount: int = Field(..., description="Number of positive interactions")
-    status: Literal["ACTIVE", "STOPPED"] = Field(..., description="Current status of the session")
-    analysisStatus: Literal["PENDING", "PROCESSING", "COMPLETED", "FAILED"] = Field(
+    status: SessionStatus = Field(..., description="Current status of the session")
+    analysisStatus: AnalysisStatus = Field(
         "PENDING", description="Status of AI analysis for the session"
     )
 
@@ -104,13 +114,13 @@ class SessionDetailResponse(BaseModel):
     totalSeconds: int = Field(..., description="Total duration in seconds")
     flaggedCount: int = Field(..., description="Number of flagged interactions")
     positiveCount: int = Field(..., description="Number of positive interactions")
-    status: Literal["ACTIVE", "STOPPED"] = Field(..., description="Current status of the session")
-    device: Literal["ios", "android", "unknown"] = Field(..., description="Device type")
+    status: SessionStatus = Field(..., description="Current status of the session")
+    device: Device = Field(..., description="Device type")
     note: Optional[str] = Field(None, description="User's reflection note for this session")
     updatedAt: Optional[datetime] = Field(None, description="When the note was last updated")
     audioUrl: Optional[str] = Field(None, description="URL/path to the audio file for this session")
     audioProcessed: bool = Field(False, description="Whether the audio has been processed")
-    analysisStatus: Literal["PENDING", "PROCESSING", "COMPLETED", "FAILED"] = Field(
+    analysisStatus: AnalysisStatus = Field(
         "PENDING",
         description="Status of AI analysis for this session"
     )
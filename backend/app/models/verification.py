@@ -9,6 +9,12 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 
 
+# Allowed values, defined once and shared by the models and policy below
+Decision = Literal["OWNER", "OTHER"]
+InternalState = Literal["OWNER", "UNCERTAIN", "OTHER", "SKIPPED"]
+VerificationStatus = Literal["SUCCESS", "SKIPPED", "ERROR"]
+
+
 class VerificationDecision(BaseModel):
     """Verification decision with metadata.
     
@@ -21,11 +27,11 @@ class VerificationDecision(BaseModel):
     - decision: User-facing decision (OWNER or OTHER)
     - internalState: Internal state for logging (OWNER, UNCERTAIN, OTHER, SKIPPED)
     """
-    decision: Literal["OWNER", "OTHER"] = Field(
+    decision: Decision = Field(
         ...,
         description="User-facing verification decision (binary)"
     )
-    internalState: Literal["OWNER", "UNCERTAIN", "OTHER", "SKIPPED"] = Field(
+    internalState: InternalState = Field(
         ...,
         description="Internal state for logging/debugging (includes UNCERTAIN, SKIPPED)"
     )
@@ -68,15 +74,15 @@ class VerificationResult(BaseModel):
     - internalStatus: Internal status for logging (includes SKIPPED, ERROR)
     - shouldProcess: Always True in v1 (verification filters, doesn't block)
     """
-    status: Literal["SUCCESS", "SKIPPED", "ERROR"] = Field(
+    status: VerificationStatus = Field(
         ...,
         description="Internal verification status (for logging)"
     )
-    decision: Literal["OWNER", "OTHER"] = Field(
+    decision: Decision = Field(
         ...,
         description="User-facing binary decision"
     )
-    internalStatus: Literal["SUCCESS", "SKIPPED", "ERROR"] = Field(
+    internalStatus: VerificationStatus = Field(
         ...,
         description="Internal status (same as status, kept for clarity)"
     )
@@ -122,6 +128,12 @@ class VerificationResult(BaseModel):
     verifiedAt: datetime = Field(..., description="When verification was performed")
 
 
+# (user_facing_decision, internal_state) results of VerificationPolicy
+_OWNER_OWNER: tuple[Decision, InternalState] = ("OWNER", "OWNER")
+_OTHER_UNCERTAIN: tuple[Decision, InternalState] = ("OTHER", "UNCERTAIN")
+_OTHER_OTHER: tuple[Decision, InternalState] = ("OTHER", "OTHER")
+
+
 class VerificationPolicy:
     """V1 Simplified Decision Policy for Speaker Verification.
     
@@ -160,7 +172,7 @@ class VerificationPolicy:
         max_similarity: float,
         owner_threshold: float,
         uncertain_threshold: float
-    ) -> tuple[Literal["OWNER", "OTHER"], Literal["OWNER", "UNCERTAIN", "OTHER", "SKIPPED"]]:
+    ) -> tuple[Decision, InternalState]:
         """Apply v1 simplified binary decision policy.
         
         Returns:
@@ -168,18 +180,14 @@ class VerificationPolicy:
             - user_facing_decision: OWNER or OTHER (binary)
             - internal_state: OWNER, UNCERTAIN, OTHER, or SKIPPED (for logging)
         """
-        # Determine internal state (for logging)
+        # Determine internal state (for logging); the result tuples are
+        # module constants, so a call is just the comparisons
         if max_similarity >= owner_threshold:
-            internal_state = "OWNER"
-            user_decision = "OWNER"
+            return _OWNER_OWNER
         elif max_similarity >= uncertain_threshold:
-            internal_state = "UNCERTAIN"  # Logged internally, but mapped to OTHER
-            user_decision = "OTHER"
+            return _OTHER_UNCERTAIN  # Logged internally, but mapped to OTHER
         else:
-            internal_state = "OTHER"
-            user_decision = "OTHER"
-        
-        return user_decision, internal_state
+            return _OTHER_OTHER
     
     @staticmethod
     def apply_decision(
@@ -187,7 +195,7 @@ class VerificationPolicy:
         top_k_mean: float,
         owner_threshold: float,
         uncertain_threshold: float
-    ) -> tuple[Literal["OWNER", "OTHER"], Literal["OWNER", "UNCERTAIN", "OTHER"]]:
+    ) -> tuple[Decision, Literal["OWNER", "UNCERTAIN", "OTHER"]]:
         """Apply decision policy (v1 simplified - uses only max_similarity).
         
         Args:
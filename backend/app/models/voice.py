@@ -42,6 +42,10 @@ class VoiceProfile(BaseModel):
         None,
         description="Metadata for each enrollment embedding"
     )
+    embeddingsNormalized: Optional[bool] = Field(
+        None,
+        description="True if stored embeddings are L2-normalized (unit length)"
+    )
     
     # Model versioning
     model: Optional[str] = Field(None, description="Model ID used for embedding extraction")
@@ -2,6 +2,8 @@ from typing import List, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.models.category import SpeechCategoryDistribution
+
 
 class DailyTotal(BaseModel):
     """Daily totals for a specific date."""
@@ -10,12 +12,7 @@ class DailyTotal(BaseModel):
     sessions: int = Field(..., description="Total number of sessions for this day")
 
 
-class WeeklyCategoryDistribution(BaseModel):
-    """Category distribution for the week."""
-    gossip: float = Field(0.0, description="Percentage of gossip speech")
-    unethical: float = Field(0.0, description="Percentage of unethical speech")
-    waste: float = Field(0.0, description="Percentage of waste speech")
-    productive: float = Field(0.0, description="Percentage of productive speech")
+WeeklyCategoryDistribution = SpeechCategoryDistribution
 
 
 class WeeklyStatsResponse(BaseModel):
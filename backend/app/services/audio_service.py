@@ -1,5 +1,6 @@
 """Service for audio normalization and processing."""
 
+import logging
 import os
 from typing import Dict, Any, Optional
 from pydub import AudioSegment
@@ -10,6 +11,8 @@ TARGET_SAMPLE_RATE = 16000  # 16kHz for Whisper and speaker diarization
 TARGET_CHANNELS = 1  # Mono
 TARGET_FORMAT = "wav"
 
+logger = logging.getLogger(__name__)
+
 
 def normalize_audio(input_path: str, output_path: str) -> str:
     """Normalize audio file to AI-ready format (16kHz mono WAV).
@@ -33,20 +36,22 @@ def normalize_audio(input_path: str, output_path: str) -> str:
         Exception: If audio processing fails
     """
     try:
-        print(f"[AUDIO_SERVICE] Normalizing audio: {input_path} -> {output_path}")
+        logger.debug("[AUDIO_SERVICE] Normalizing audio: %s -> %s", input_path, output_path)
         
         # Load audio file
-        # pydub automatically detects format from extension
+        # pydub automatically detects format from extension. .wav input is
+        # decoded in-process (no ffmpeg subprocess); only other formats such
+        # as M4A are converted through ffmpeg.
         audio = AudioSegment.from_file(input_path)
         
         # Convert to mono if stereo
         if audio.channels > TARGET_CHANNELS:
-            print(f"[AUDIO_SERVICE] Converting from {audio.channels} channels to mono")
+            logger.debug("[AUDIO_SERVICE] Converting from %s channels to mono", audio.channels)
             audio = audio.set_channels(TARGET_CHANNELS)
         
         # Resample to target sample rate if needed
         if audio.frame_rate != TARGET_SAMPLE_RATE:
-            print(f"[AUDIO_SERVICE] Resampling from {audio.frame_rate}Hz to {TARGET_SAMPLE_RATE}Hz")
+            logger.debug("[AUDIO_SERVICE] Resampling from %sHz to %sHz", audio.frame_rate, TARGET_SAMPLE_RATE)
             audio = audio.set_frame_rate(TARGET_SAMPLE_RATE)
         
         # Normalize volume levels (peak normalization)
@@ -60,14 +65,14 @@ def normalize_audio(input_path: str, output_path: str) -> str:
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path) if os.path.dirname(output_path) else ".", exist_ok=True)
         
-        # Export as WAV
+        # Export as WAV (written in-process, no ffmpeg subprocess)
         audio.export(output_path, format=TARGET_FORMAT)
         
-        print(f"[AUDIO_SERVICE] Successfully normalized audio: {output_path}")
+        logger.debug("[AUDIO_SERVICE] Successfully normalized audio: %s", output_path)
         return output_path
         
     except Exception as e:
-        print(f"[AUDIO_SERVICE] Error normalizing audio: {e}")
+        logger.error("[AUDIO_SERVICE] Error normalizing audio: %s", e)
         raise Exception(f"Failed to normalize audio: {str(e)}")
 
 
@@ -100,7 +105,7 @@ def extract_audio_metadata(file_path: str) -> Dict[str, Any]:
         metadata['bitDepth'] = 16 if metadata['format'] == 'WAV' else None
         
     except Exception as e:
-        print(f"[AUDIO_SERVICE] Error extracting metadata: {e}")
+        logger.error("[AUDIO_SERVICE] Error extracting metadata: %s", e)
     
     return metadata
 
@@ -124,14 +129,17 @@ def validate_audio_format(file_path: str) -> bool:
         )
         
         if not is_valid:
-            print(f"[AUDIO_SERVICE] Audio format validation failed:")
-            print(f"  Sample rate: {audio.frame_rate}Hz (expected {TARGET_SAMPLE_RATE}Hz)")
-            print(f"  Channels: {audio.channels} (expected {TARGET_CHANNELS})")
-            print(f"  Format: {os.path.splitext(file_path)[1]} (expected .wav)")
+            logger.warning(
+                "[AUDIO_SERVICE] Audio format validation failed: sample rate %sHz (expected %sHz), "
+                "channels %s (expected %s), format %s (expected .wav)",
+                audio.frame_rate, TARGET_SAMPLE_RATE,
+                audio.channels, TARGET_CHANNELS,
+                os.path.splitext(file_path)[1],
+            )
         
         return is_valid
         
     except Exception as e:
-        print(f"[AUDIO_SERVICE] Error validating audio format: {e}")
+        logger.error("[AUDIO_SERVICE] Error validating audio format: %s", e)
         return False
 
@@ -5,9 +5,8 @@ Extracts speaker embeddings using MFCC (Mel-frequency cepstral coefficients) fea
 This replaces the previous HuggingFace-based embedding extraction.
 """
 import os
+from functools import lru_cache
 import numpy as np
-import scipy.io.wavfile as wavfile
-from scipy.fft import dct
 from typing import List
 import logging
 
@@ -36,6 +35,9 @@ def extract_speaker_embedding(audio_path: str) -> List[float]:
     if not os.path.exists(audio_path):
         raise FileNotFoundError(f"Audio file not found: {audio_path}")
     
+    # scipy is imported on first use so it stays off the app's startup path
+    import scipy.io.wavfile as wavfile
+    
     try:
         # Load audio file
         sample_rate, audio = wavfile.read(audio_path)
@@ -90,12 +92,12 @@ def extract_speaker_embedding(audio_path: str) -> List[float]:
         
         embedding = embedding_array.tolist()
         
-        logger.info(f"Extracted {len(embedding)}-dim MFCC embedding from {audio_path}")
+        logger.debug("Extracted %s-dim MFCC embedding from %s", len(embedding), audio_path)
         
         return embedding
         
     except Exception as e:
-        logger.error(f"Error extracting MFCC embedding from {audio_path}: {e}")
+        logger.error("Error extracting MFCC embedding from %s: %s", audio_path, e)
         raise ValueError(f"Failed to extract speaker embedding: {str(e)}")
 
 
@@ -132,14 +134,42 @@ def extract_mfcc(audio: np.ndarray, sample_rate: int, n_mfcc: int = 13, n_fft: i
     frames = pad_signal[indices.astype(np.int32, copy=False)]
     
     # Apply Hamming window
-    frames *= np.hamming(frame_length)
+    frames *= _hamming_window(frame_length)
     
     # FFT and Power Spectrum
     mag_frames = np.absolute(np.fft.rfft(frames, n_fft))
     pow_frames = ((1.0 / n_fft) * ((mag_frames) ** 2))
     
-    # Mel Filter Bank
-    nfilt = 40
+    # Mel Filter Bank (built once per configuration, see _mel_filterbank)
+    fbank = _mel_filterbank(sample_rate, n_fft)
+    
+    # Apply Mel filterbank to power spectrum
+    filter_banks = np.dot(pow_frames, fbank.T)
+    filter_banks = np.where(filter_banks == 0, np.finfo(float).eps, filter_banks)
+    filter_banks = 20 * np.log10(filter_banks)
+    
+    # DCT to get MFCC coefficients
+    from scipy.fft import dct
+    mfcc = dct(filter_banks, type=2, axis=1, norm='ortho')[:, 1 : (n_mfcc + 1)]
+    
+    return mfcc
+
+
+@lru_cache(maxsize=8)
+def _hamming_window(frame_length: int) -> np.ndarray:
+    """Hamming window for a frame length (cached, read-only)."""
+    window = np.hamming(frame_length)
+    window.flags.writeable = False
+    return window
+
+
+@lru_cache(maxsize=8)
+def _mel_filterbank(sample_rate: int, n_fft: int, nfilt: int = 40) -> np.ndarray:
+    """Triangular Mel filterbank (nfilt x n_fft/2+1), cached and read-only.
+
+    The filterbank only depends on the configuration, so it is built once
+    instead of on every embedding extraction.
+    """
     low_freq_mel = 0
     high_freq_mel = (2595 * np.log10(1 + (sample_rate / 2) / 700))
     mel_points = np.linspace(low_freq_mel, high_freq_mel, nfilt + 2)
@@ -158,13 +188,5 @@ def extract_mfcc(audio: np.ndarray, sample_rate: int, n_mfcc: int = 13, n_fft: i
             else:
                 fbank[m - 1, k] = (bin[m + 1] - k) / (bin[m + 1] - bin[m])
     
-    # Apply Mel filterbank to power spectrum
-    filter_banks = np.dot(pow_frames, fbank.T)
-    filter_banks = np.where(filter_banks == 0, np.finfo(float).eps, filter_banks)
-    filter_banks = 20 * np.log10(filter_banks)
-    
-    # DCT to get MFCC coefficients
-    mfcc = dct(filter_banks, type=2, axis=1, norm='ortho')[:, 1 : (n_mfcc + 1)]
-    
-    return mfcc
-
+    fbank.flags.writeable = False
+    return fbank
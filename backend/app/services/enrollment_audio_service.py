@@ -0,0 +1,130 @@
+"""
+Enrollment Audio Service
+
+CPU-bound preparation of voice enrollment recordings: normalize to 16kHz
+WAV, validate quality and extract the speaker embedding.
+
+The work runs in a process pool so the recordings of one enrollment (and
+of concurrent enrollments) use separate cores instead of contending on
+the GIL. Everything submitted to the pool must be top-level and picklable,
+so failures are reported with EnrollmentSampleError rather than FastAPI's
+HTTPException.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from app.services.audio_service import normalize_audio
+from app.services.audio_quality_service import validate_audio_quality
+from app.services.embedding_service import extract_speaker_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def _init_worker() -> None:
+    """Log straight to stderr from worker processes.
+
+    The server's app.* loggers go through a QueueHandler drained by a
+    listener thread that only exists in the server process.
+    """
+    app_logger = logging.getLogger("app")
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(levelname)s %(name)s [worker %(process)d] %(message)s"))
+    app_logger.handlers[:] = [stream_handler]
+    app_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    app_logger.propagate = False
+
+
+# Worker processes are started lazily on first use. "spawn" gives them a
+# fresh interpreter instead of forking a server that already runs gRPC and
+# logging threads. Shut down by the app lifespan (shutdown_enrollment_executor).
+enrollment_executor = ProcessPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1),
+    mp_context=multiprocessing.get_context("spawn"),
+    initializer=_init_worker,
+)
+
+
+def shutdown_enrollment_executor() -> None:
+    """Stop the worker processes, dropping enrollments that haven't started."""
+    enrollment_executor.shutdown(wait=True, cancel_futures=True)
+
+
+class EnrollmentSampleError(Exception):
+    """A recording was rejected; carries the HTTP status and user message."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def prepare_enrollment_sample(i: int, total: int, upload_path: str, normalized_path: str, file_extension: str) -> List[float]:
+    """Normalize, quality-check and embed one enrollment recording.
+
+    CPU-bound (audio decoding, quality scans, MFCC extraction); top-level
+    and picklable so it can run in a worker process.
+
+    Args:
+        i: Zero-based index of the recording
+        total: Number of recordings in the enrollment
+        upload_path: Temporary file holding the uploaded audio
+        normalized_path: Temporary file to write the 16kHz WAV to
+        file_extension: Extension of the uploaded file
+
+    Returns:
+        Speaker embedding for the recording
+
+    Raises:
+        EnrollmentSampleError: 400 if the recording fails quality validation,
+            500 if no embedding could be extracted
+    """
+    # Normalize audio to 16kHz WAV before validation (handles format conversion)
+    # This allows Android M4A files to be converted to WAV at correct sample rate
+    validation_file = upload_path
+    try:
+        normalize_audio(upload_path, normalized_path)
+        validation_file = normalized_path
+        logger.debug("[ENROLLMENT] Normalized file %s from %s to WAV at 16kHz", i+1, file_extension)
+    except Exception as normalize_error:
+        # If normalization fails, try validating original file
+        logger.warning("[ENROLLMENT] Normalization failed for file %s, using original file: %s", i+1, normalize_error)
+        validation_file = upload_path
+    
+    # Validate audio quality BEFORE extracting embedding or storing
+    logger.debug("[ENROLLMENT] Validating audio quality for file %s/%s", i+1, total)
+    quality_result = validate_audio_quality(validation_file)
+    
+    if quality_result.status == "FAIL":
+        # Build detailed error message
+        error_detail = f"File {i+1} failed quality validation: {quality_result.message}"
+        if quality_result.reasons:
+            error_detail += f" (Reasons: {', '.join(quality_result.reasons)})"
+        
+        raise EnrollmentSampleError(400, error_detail)
+    
+    # Store quality metrics for passed recordings (for audit/debugging)
+    # (argument lookups are skipped entirely unless DEBUG is enabled)
+    if logger.isEnabledFor(logging.DEBUG):
+        metrics = quality_result.metrics
+        logger.debug("[ENROLLMENT] File %s passed quality validation: duration=%.1fs, silence=%.1f%%, RMS=%.0f, clipping=%.1f%%", i+1, metrics.get('durationSeconds', 0), metrics.get('silenceRatio', 0)*100, metrics.get('rms', 0), metrics.get('clippingRatio', 0)*100)
+    
+    # Extract embedding (use normalized file if available, otherwise original)
+    logger.debug("[ENROLLMENT] Extracting embedding from file %s/%s", i+1, total)
+    try:
+        embedding = extract_speaker_embedding(validation_file)
+        logger.debug("[ENROLLMENT] Extracted embedding %s (dimension: %s)", i+1, len(embedding))
+        return embedding
+    except Exception as e:
+        error_message = str(e)
+        logger.error("[ENROLLMENT] Error extracting embedding from file %s: %s", i+1, error_message)
+        
+        # Provide user-friendly error messages
+        if "too short" in error_message.lower():
+            user_message = f"Recording {i+1} is too short for voice analysis. Please record for longer."
+        else:
+            user_message = f"Failed to process recording {i+1}. Please try recording again."
+        
+        raise EnrollmentSampleError(500, user_message)
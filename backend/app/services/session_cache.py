@@ -0,0 +1,321 @@
+"""
+Session Cache Service
+
+Short-lived, per-user cache of parsed STOPPED listening sessions.
+
+The dashboard requests /stats/weekly, /stats/monthly and /stats/lifetime
+back-to-back, and each of them needs the same listening_sessions rows.
+Instead of streaming the collection once per endpoint, the parsed rows are
+cached per user for a short TTL and shared between the stats endpoints.
+
+Every stats read goes through stats_query_builder(), which refuses to
+build a query without a startedAt range. Streaming a user's whole
+history and filtering client-side is not allowed.
+
+The finished stats responses are cached as well (keyed by user and
+period) so polling dashboards do not re-aggregate on every refresh.
+Both caches are dropped for a user when one of their sessions changes.
+"""
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Hashable, List, Optional, Tuple
+
+from cachetools import TTLCache
+from firebase_admin import firestore
+
+_UTC = timezone.utc
+
+# Lower bound for "all time" reads (lifetime stats)
+STATS_EPOCH = datetime(1970, 1, 1, tzinfo=_UTC)
+# date.toordinal() of STATS_EPOCH; epoch day + EPOCH_DAY_ORDINAL = ordinal
+EPOCH_DAY_ORDINAL = STATS_EPOCH.toordinal()
+
+# invalidate_user_sessions() only reaches the current worker process, so
+# every cache here is kept short: long enough for one dashboard load
+# (weekly, monthly and lifetime requested back-to-back) and polling bursts,
+# short enough that other workers never serve totals older than a few seconds
+SESSION_CACHE_TTL_SECONDS = 5
+SESSION_CACHE_MAX_USERS = 10_000
+
+# Sessions are read in pages of this size using start_after() cursors.
+# Never use offset(): Firestore bills every skipped document.
+SESSION_PAGE_SIZE = 500
+
+# uid -> (since, until, rows): parsed STOPPED sessions that started in
+# [since, until]. until is None when the fetch reached the present.
+_sessions_cache: TTLCache = TTLCache(maxsize=SESSION_CACHE_MAX_USERS, ttl=SESSION_CACHE_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+# Computed stats responses per endpoint (same cross-worker bound as above)
+STATS_RESPONSE_TTL_SECONDS = {
+    'weekly': 5,
+    'monthly': 5,
+    'lifetime': 5,
+    'summary': 5,
+}
+# kind -> TTLCache[(uid, period) -> serialized JSON response body]
+_stats_response_caches = {
+    kind: TTLCache(maxsize=SESSION_CACHE_MAX_USERS, ttl=ttl)
+    for kind, ttl in STATS_RESPONSE_TTL_SECONDS.items()
+}
+
+# Classification labels written by the AI analysis, in the order used by
+# ParsedSession.classification: (gossip, unethical, waste, productive)
+_CLS_KEYS = ('gossip', 'insult or unethical speech', 'wasteful talk', 'productive or meaningful speech')
+_ZERO_SCORES = (0.0, 0.0, 0.0, 0.0)
+
+# Only the fields the stats endpoints read. Classification keys contain
+# spaces, so they must be backquoted in the field path.
+_SESSION_FIELDS = [
+    'startedAt',
+    'startedDay',
+    'status',
+    'totals.totalSeconds',
+] + [f"classification.`{key}`" for key in _CLS_KEYS]
+
+
+@dataclass(slots=True)
+class ParsedSession:
+    """A STOPPED listening session reduced to the fields used by stats.
+
+    Attributes:
+        started_at_dt: Session start as a timezone-aware UTC datetime
+        started_at_ts: Session start as epoch seconds (for cheap range checks)
+        started_day: Session start as whole UTC days since 1970-01-01
+        total_seconds: Listening time in seconds (totals.totalSeconds)
+        classification: Category scores as (gossip, unethical, waste, productive);
+            all zeros when the session has no AI classification yet
+    """
+    started_at_dt: datetime
+    started_at_ts: float
+    started_day: int
+    total_seconds: float
+    classification: Tuple[float, float, float, float]
+
+
+def get_firestore_db():
+    """Get Firestore database instance."""
+    try:
+        return firestore.client()
+    except Exception as e:
+        raise RuntimeError(f"Firestore not available: {e}")
+
+
+def started_bucket_fields(started_at_dt: datetime) -> dict:
+    """Integer day/month buckets stored alongside startedAt.
+
+    Written on listening_sessions so readers can bucket sessions with
+    integer arithmetic instead of formatting dates.
+
+    Args:
+        started_at_dt: Session start (timezone-aware)
+
+    Returns:
+        dict with startedDay (UTC days since epoch) and startedMonth
+        (year * 12 + month, UTC)
+    """
+    started_at_utc = started_at_dt.astimezone(_UTC)
+    return {
+        'startedDay': int(started_at_utc.timestamp() // 86400),
+        'startedMonth': started_at_utc.year * 12 + started_at_utc.month,
+    }
+
+
+def to_utc(ts) -> Optional[datetime]:
+    """Convert a Firestore timestamp value into a timezone-aware UTC datetime.
+
+    Firestore returns DatetimeWithNanoseconds, which is already a datetime,
+    so that is checked first; other objects exposing timestamp() fall back
+    to a conversion. Returns None for unsupported values.
+    """
+    if isinstance(ts, datetime):
+        return ts if ts.tzinfo else ts.replace(tzinfo=_UTC)
+    if hasattr(ts, 'timestamp'):
+        return datetime.fromtimestamp(ts.timestamp(), tz=_UTC)
+    return None
+
+
+def _parse_session(session_data: dict) -> Optional[ParsedSession]:
+    """Convert a raw listening_sessions document into a ParsedSession.
+
+    Returns None for documents that should not be counted (not STOPPED,
+    or missing/invalid startedAt).
+    """
+    if session_data.get('status') != 'STOPPED':
+        return None
+
+    started_at = session_data.get('startedAt')
+    if not started_at:
+        return None
+
+    started_at_dt = to_utc(started_at)
+    if started_at_dt is None:
+        return None
+
+    started_at_ts = started_at_dt.timestamp()
+
+    # Sessions written before startedDay existed get it derived here
+    started_day = session_data.get('startedDay')
+    if not isinstance(started_day, int):
+        started_day = int(started_at_ts // 86400)
+
+    # Projected query: totals only carries totalSeconds (or is absent/null)
+    totals = session_data.get('totals')
+    total_seconds = (totals.get('totalSeconds') or 0) if isinstance(totals, dict) else 0
+
+    # Category scores only exist once AI analysis has completed.
+    # Scores may be stored as strings, so coerce to float.
+    classification = session_data.get('classification')
+    if classification and isinstance(classification, dict):
+        scores = tuple(float(classification.get(key, 0.0) or 0.0) for key in _CLS_KEYS)
+    else:
+        scores = _ZERO_SCORES
+
+    return ParsedSession(
+        started_at_dt=started_at_dt,
+        started_at_ts=started_at_ts,
+        started_day=started_day,
+        total_seconds=total_seconds,
+        classification=scores,
+    )
+
+
+def stats_query_builder(db, uid: str, since: datetime, until: datetime):
+    """Build the STOPPED-sessions query used by every stats read.
+
+    Applies the uid/status equality filters, a server-side startedAt range,
+    the stats field projection and newest-first ordering (served by the
+    (uid, status, startedAt DESC) composite index).
+
+    Args:
+        db: Firestore client
+        uid: User ID
+        since: Earliest startedAt to include (timezone-aware)
+        until: Latest startedAt to include (timezone-aware)
+
+    Returns:
+        Firestore Query
+
+    Raises:
+        ValueError: If `since` or `until` is missing
+    """
+    if since is None or until is None:
+        raise ValueError("Stats queries require both 'since' and 'until' startedAt bounds")
+
+    return db.collection('listening_sessions') \
+        .where('uid', '==', uid) \
+        .where('status', '==', 'STOPPED') \
+        .where('startedAt', '>=', since) \
+        .where('startedAt', '<=', until) \
+        .select(_SESSION_FIELDS) \
+        .order_by('startedAt', direction=firestore.Query.DESCENDING)
+
+
+def _fetch_stopped_sessions(uid: str, since: datetime, until: datetime) -> List[ParsedSession]:
+    """Read and parse the user's STOPPED sessions in [since, until], newest first.
+
+    Pages through the query with cursors so each Firestore call stays bounded.
+    """
+    db = get_firestore_db()
+
+    base_query = stats_query_builder(db, uid, since, until).limit(SESSION_PAGE_SIZE)
+
+    rows = []
+    last_doc = None
+    while True:
+        page_query = base_query.start_after(last_doc) if last_doc is not None else base_query
+        page = list(page_query.stream())
+        for doc in page:
+            row = _parse_session(doc.to_dict())
+            if row is not None:
+                rows.append(row)
+        if len(page) < SESSION_PAGE_SIZE:
+            break
+        last_doc = page[-1]
+    return rows
+
+
+def get_stopped_sessions(uid: str, since: datetime, until: Optional[datetime] = None) -> List[ParsedSession]:
+    """Get the user's parsed STOPPED sessions that started in [since, until].
+
+    Rows are cached per user for SESSION_CACHE_TTL_SECONDS together with the
+    range they were fetched for. A later request whose window lies inside
+    that range is served from memory (e.g. weekly after lifetime); any
+    other window refetches only its own range, newest first, so a past
+    month never scans the sessions recorded since. A fetch with no `until`,
+    or one in the future, covers everything up to now and is cached
+    open-ended, so it serves any later window (including ones that end in
+    the future); sessions stopped after it invalidate the entry.
+
+    Args:
+        uid: User ID
+        since: Earliest startedAt to include (timezone-aware). Use
+            STATS_EPOCH for all-time reads.
+        until: Latest startedAt to include (timezone-aware), or None for
+            "up to now"
+
+    Returns:
+        List of ParsedSession rows, newest first
+    """
+    with _cache_lock:
+        entry = _sessions_cache.get(uid)
+
+    if entry is not None and entry[0] <= since and (
+        entry[1] is None or (until is not None and until <= entry[1])
+    ):
+        rows = entry[2]
+    else:
+        now = datetime.now(_UTC)
+        covered_until = None if until is None or until >= now else until
+        rows = _fetch_stopped_sessions(uid, since, until if until is not None else now)
+        with _cache_lock:
+            current = _sessions_cache.get(uid)
+            # Only replace an entry that this fetch fully covers
+            if current is None or (
+                since <= current[0]
+                and (covered_until is None or (current[1] is not None and current[1] <= covered_until))
+            ):
+                _sessions_cache[uid] = (since, covered_until, rows)
+
+    # Compare epoch seconds rather than aware datetimes
+    since_ts = since.timestamp()
+    if until is None:
+        return [row for row in rows if since_ts <= row.started_at_ts]
+    until_ts = until.timestamp()
+    return [row for row in rows if since_ts <= row.started_at_ts <= until_ts]
+
+
+def get_cached_stats_response(kind: str, uid: str, period: Hashable) -> Optional[Any]:
+    """Get a previously computed stats response.
+
+    Args:
+        kind: Stats endpoint ('weekly', 'monthly', 'lifetime' or 'summary')
+        uid: User ID
+        period: Hashable identifier of the period the response covers
+            (e.g. the week start date or (year, month))
+
+    Returns:
+        The cached response (the serialized JSON body), or None on a miss
+    """
+    with _cache_lock:
+        return _stats_response_caches[kind].get((uid, period))
+
+
+def cache_stats_response(kind: str, uid: str, period: Hashable, response: Any) -> None:
+    """Store a computed stats response for STATS_RESPONSE_TTL_SECONDS[kind]."""
+    with _cache_lock:
+        _stats_response_caches[kind][(uid, period)] = response
+
+
+def invalidate_user_sessions(uid: str) -> None:
+    """Drop the cached sessions and stats responses for a user.
+
+    Call this whenever a session is stopped or its totals/classification
+    change so the next stats request sees fresh data.
+    """
+    with _cache_lock:
+        _sessions_cache.pop(uid, None)
+        for response_cache in _stats_response_caches.values():
+            for key in [key for key in response_cache.keys() if key[0] == uid]:
+                response_cache.pop(key, None)
@@ -0,0 +1,168 @@
+"""
+Similarity Kernels
+
+Batched cosine similarity for speaker embeddings.
+
+When simsimd is installed the distance matrix is computed with its
+runtime-dispatched SIMD kernels (AVX2/AVX-512/NEON/SVE). Without it, a
+numba JIT kernel computes norms and dot products in one pass if numba is
+installed; otherwise the rows are L2-normalized and multiplied with NumPy.
+All implementations return the same similarity matrix.
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    simsimd = None
+    SIMSIMD_AVAILABLE = False
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+
+def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True)
+    def _cosine_matrix_jit(a, b):
+        m, d = a.shape
+        n = b.shape[0]
+        norms_a = np.empty(m)
+        norms_b = np.empty(n)
+        for i in range(m):
+            s = 0.0
+            for k in range(d):
+                s += a[i, k] * a[i, k]
+            norms_a[i] = np.sqrt(s)
+        for j in range(n):
+            s = 0.0
+            for k in range(d):
+                s += b[j, k] * b[j, k]
+            norms_b[j] = np.sqrt(s)
+        out = np.zeros((m, n), dtype=np.float32)
+        for i in range(m):
+            for j in range(n):
+                if norms_a[i] == 0.0 or norms_b[j] == 0.0:
+                    continue
+                s = 0.0
+                for k in range(d):
+                    s += a[i, k] * b[j, k]
+                out[i, j] = s / (norms_a[i] * norms_b[j])
+        return out
+
+
+def cosine_similarity_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Cosine similarity between every row of `a` and every row of `b`.
+
+    Args:
+        a: (M, D) float32 matrix
+        b: (N, D) float32 matrix
+
+    Returns:
+        (M, N) float32 matrix of similarities; rows that are all zeros
+        have similarity 0.0 to everything
+
+    Raises:
+        ValueError: If the embedding dimensions differ
+    """
+    a = np.ascontiguousarray(a, dtype=np.float32)
+    b = np.ascontiguousarray(b, dtype=np.float32)
+    if a.shape[1] != b.shape[1]:
+        raise ValueError(f"Embedding dimensions must match: {a.shape[1]} vs {b.shape[1]}")
+
+    if SIMSIMD_AVAILABLE:
+        distances = np.asarray(simsimd.cdist(a, b, metric="cosine"), dtype=np.float32)
+        similarities = 1.0 - distances
+        # Keep the zero-vector convention of the NumPy path
+        zero_a = ~a.any(axis=1)
+        zero_b = ~b.any(axis=1)
+        similarities[zero_a, :] = 0.0
+        similarities[:, zero_b] = 0.0
+        return similarities
+    if NUMBA_AVAILABLE:
+        return _cosine_matrix_jit(a, b)
+    return _unit_rows(a) @ _unit_rows(b).T
+
+
+def cosine_similarity_pair(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity between two 1-D float32 vectors of equal length.
+
+    Uses simsimd.cosine when available (no temporaries, one C call);
+    otherwise dot(a, b) / sqrt(|a|^2 * |b|^2). Zero vectors give 0.0.
+    """
+    squared_norms = float(np.vdot(a, a)) * float(np.vdot(b, b))
+    if squared_norms == 0:
+        return 0.0
+    if SIMSIMD_AVAILABLE:
+        return 1.0 - float(simsimd.cosine(a, b))
+    return float(np.dot(a, b)) / np.sqrt(squared_norms)
+
+
+def quantize_unit_rows(matrix: np.ndarray) -> np.ndarray:
+    """Quantize L2-normalized rows to int8 (scale 127).
+
+    Args:
+        matrix: (N, D) matrix whose rows are unit vectors (or zero)
+
+    Returns:
+        (N, D) int8 matrix
+    """
+    return np.clip(np.rint(np.asarray(matrix, dtype=np.float32) * 127.0), -127, 127).astype(np.int8)
+
+
+def cosine_similarity_matrix_i8(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Cosine similarity between int8-quantized rows of `a` and `b`.
+
+    Uses simsimd's int8 kernels (VNNI/dot-product instructions) when
+    available, then the numba kernel (which reads the int8 rows directly);
+    otherwise the rows are widened to float32.
+
+    Args:
+        a: (M, D) int8 matrix
+        b: (N, D) int8 matrix
+
+    Returns:
+        (M, N) float32 matrix of similarities
+    """
+    a = np.ascontiguousarray(a, dtype=np.int8)
+    b = np.ascontiguousarray(b, dtype=np.int8)
+    if a.shape[1] != b.shape[1]:
+        raise ValueError(f"Embedding dimensions must match: {a.shape[1]} vs {b.shape[1]}")
+
+    if SIMSIMD_AVAILABLE:
+        distances = np.asarray(simsimd.cdist(a, b, metric="cosine"), dtype=np.float32)
+        similarities = 1.0 - distances
+        similarities[~a.any(axis=1), :] = 0.0
+        similarities[:, ~b.any(axis=1)] = 0.0
+        return similarities
+    if NUMBA_AVAILABLE:
+        return _cosine_matrix_jit(a, b)
+    return _unit_rows(a.astype(np.float32)) @ _unit_rows(b.astype(np.float32)).T
+
+
+def warm_up() -> None:
+    """Compile the JIT kernels ahead of the first request (no-op without numba).
+
+    Call once at application startup so the first enrollment or
+    verification does not pay the compilation latency.
+    """
+    if NUMBA_AVAILABLE and not SIMSIMD_AVAILABLE:
+        sample = np.ones((2, 8), dtype=np.float32)
+        cosine_similarity_matrix(sample, sample)
+        # int8 specialization used by /voice/verify
+        sample_i8 = quantize_unit_rows(sample / np.sqrt(8.0))
+        cosine_similarity_matrix_i8(sample_i8[:1], sample_i8)
+        logger.info("Similarity kernels compiled (numba)")
@@ -0,0 +1,76 @@
+"""
+Stats Kernels
+
+Numeric reductions used by the stats endpoints.
+
+When numba is installed the category reduction is JIT-compiled to a
+native loop; otherwise the same result is computed with NumPy. Callers
+always pass contiguous float64 arrays and never need to know which
+implementation is active.
+"""
+import logging
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+
+def _reduce_categories_numpy(
+    gossip: np.ndarray,
+    unethical: np.ndarray,
+    waste: np.ndarray,
+    productive: np.ndarray,
+    minutes: np.ndarray,
+) -> Tuple[float, float, float, float]:
+    return (
+        float(np.dot(gossip, minutes)),
+        float(np.dot(unethical, minutes)),
+        float(np.dot(waste, minutes)),
+        float(np.dot(productive, minutes)),
+    )
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True)
+    def _reduce_categories_jit(gossip, unethical, waste, productive, minutes):
+        g = u = w = p = 0.0
+        for i in range(minutes.shape[0]):
+            m = minutes[i]
+            g += gossip[i] * m
+            u += unethical[i] * m
+            w += waste[i] * m
+            p += productive[i] * m
+        return g, u, w, p
+
+
+def reduce_categories(
+    gossip: np.ndarray,
+    unethical: np.ndarray,
+    waste: np.ndarray,
+    productive: np.ndarray,
+    minutes: np.ndarray,
+) -> Tuple[float, float, float, float]:
+    """Sum each category score weighted by session duration.
+
+    Args:
+        gossip: Per-session gossip scores (float64)
+        unethical: Per-session unethical scores (float64)
+        waste: Per-session waste scores (float64)
+        productive: Per-session productive scores (float64)
+        minutes: Per-session listening minutes (float64)
+
+    Returns:
+        Tuple of weighted totals (gossip, unethical, waste, productive)
+    """
+    if NUMBA_AVAILABLE:
+        g, u, w, p = _reduce_categories_jit(gossip, unethical, waste, productive, minutes)
+        return float(g), float(u), float(w), float(p)
+    return _reduce_categories_numpy(gossip, unethical, waste, productive, minutes)
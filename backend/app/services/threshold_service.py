@@ -5,6 +5,7 @@ This service manages verification thresholds dynamically, allowing for
 environment-specific configuration and calibration based on similarity distributions.
 No hardcoded thresholds are used - all values come from configuration.
 """
+import logging
 import os
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
@@ -12,6 +13,8 @@ from firebase_admin import firestore
 
 from app.models.threshold_config import ThresholdConfig, SimilarityDistribution
 
+logger = logging.getLogger(__name__)
+
 
 # Default thresholds (can be overridden by environment variables or Firestore)
 DEFAULT_OWNER_THRESHOLD = float(os.getenv("VERIFICATION_OWNER_THRESHOLD", "0.75"))
@@ -19,12 +22,22 @@ DEFAULT_UNCERTAIN_THRESHOLD = float(os.getenv("VERIFICATION_UNCERTAIN_THRESHOLD"
 DEFAULT_ENVIRONMENT = os.getenv("VERIFICATION_ENVIRONMENT", "dev")
 
 
+_db = None
+
+
 def get_firestore_db():
-    """Get Firestore database instance."""
-    try:
-        return firestore.client()
-    except Exception as e:
-        raise RuntimeError(f"Firestore not available: {e}")
+    """Get the shared Firestore client (created on first use).
+
+    Called on every verification (threshold lookup and similarity logging),
+    so the client is created once instead of looked up per call.
+    """
+    global _db
+    if _db is None:
+        try:
+            _db = firestore.client()
+        except Exception as e:
+            raise RuntimeError(f"Firestore not available: {e}")
+    return _db
 
 
 def get_threshold_config(environment: Optional[str] = None) -> ThresholdConfig:
@@ -59,7 +72,7 @@ def get_threshold_config(environment: Optional[str] = None) -> ThresholdConfig:
                 )
             return ThresholdConfig(**config_data)
     except Exception as e:
-        print(f"[THRESHOLD] Error loading from Firestore: {e}, using defaults")
+        logger.warning("[THRESHOLD] Error loading from Firestore: %s, using defaults", e)
     
     # Fallback to environment variables or defaults
     owner_threshold = float(os.getenv(f"VERIFICATION_OWNER_THRESHOLD_{env.upper()}", str(DEFAULT_OWNER_THRESHOLD)))
@@ -85,9 +98,9 @@ def update_threshold_config(config: ThresholdConfig) -> None:
         db = get_firestore_db()
         config_ref = db.collection('verification_thresholds').document(config.environment)
         config_ref.set(config.dict(), merge=False)
-        print(f"[THRESHOLD] Updated threshold configuration for {config.environment}")
+        logger.info("[THRESHOLD] Updated threshold configuration for %s", config.environment)
     except Exception as e:
-        print(f"[THRESHOLD] Error updating threshold configuration: {e}")
+        logger.error("[THRESHOLD] Error updating threshold configuration: %s", e)
         raise
 
 
@@ -128,7 +141,7 @@ def log_similarity_score(uid: str, similarity: float, decision: str, environment
         
     except Exception as e:
         # Non-critical - logging failure shouldn't break verification
-        print(f"[THRESHOLD] Error logging similarity score: {e}")
+        logger.error("[THRESHOLD] Error logging similarity score: %s", e)
 
 
 def compute_similarity_distribution(uid: Optional[str] = None, environment: Optional[str] = None) -> SimilarityDistribution:
@@ -193,7 +206,7 @@ def compute_similarity_distribution(uid: Optional[str] = None, environment: Opti
         )
         
     except Exception as e:
-        print(f"[THRESHOLD] Error computing similarity distribution: {e}")
+        logger.error("[THRESHOLD] Error computing similarity distribution: %s", e)
         # Return default on error
         return SimilarityDistribution(
             mean=0.5,
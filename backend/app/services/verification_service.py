@@ -5,15 +5,24 @@ This service implements multi-embedding comparison using max similarity
 and top-K mean similarity, applies decision policies, and logs results
 for auditability. Implements fail-closed behavior on errors.
 """
+import logging
 from typing import List, Optional, Tuple
 from datetime import datetime, timezone
 import numpy as np
 
 from app.services.embedding_service import extract_speaker_embedding
+from app.services.similarity_kernels import (
+    cosine_similarity_pair,
+    cosine_similarity_matrix,
+    cosine_similarity_matrix_i8,
+    quantize_unit_rows,
+)
 from app.services.threshold_service import get_threshold_config, log_similarity_score
 from app.services.model_versioning_service import get_current_model_metadata, check_embedding_compatibility
 from app.models.verification import VerificationResult, VerificationDecision, ChunkVerification, VerificationPolicy
 
+logger = logging.getLogger(__name__)
+
 
 def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float:
     """Compute cosine similarity between two embedding vectors.
@@ -28,27 +37,21 @@ def cosine_similarity(embedding1: List[float], embedding2: List[float]) -> float
     if len(embedding1) != len(embedding2):
         raise ValueError(f"Embedding dimensions must match: {len(embedding1)} vs {len(embedding2)}")
     
-    # Convert to numpy arrays
-    vec1 = np.array(embedding1)
-    vec2 = np.array(embedding2)
-    
-    # Compute cosine similarity
-    dot_product = np.dot(vec1, vec2)
-    norm1 = np.linalg.norm(vec1)
-    norm2 = np.linalg.norm(vec2)
-    
-    if norm1 == 0 or norm2 == 0:
-        return 0.0
+    # float32 arrays so the dot products dispatch to BLAS (no copy if already float32)
+    vec1 = np.asarray(embedding1, dtype=np.float32)
+    vec2 = np.asarray(embedding2, dtype=np.float32)
     
-    similarity = dot_product / (norm1 * norm2)
-    return float(similarity)
+    # simsimd when installed, else dot(a, b) / sqrt(|a|^2 * |b|^2)
+    return float(cosine_similarity_pair(vec1, vec2))
 
 
 def verify_speaker(
     session_embedding: List[float],
     enrollment_embeddings: List[List[float]],
     environment: Optional[str] = None,
-    uid: Optional[str] = None
+    uid: Optional[str] = None,
+    enrollment_normalized: bool = False,
+    enrollment_quantized: bool = False
 ) -> Tuple[VerificationDecision, Optional[str]]:
     """Verify speaker identity using multi-embedding comparison.
     
@@ -82,39 +85,69 @@ def verify_speaker(
         enrollment_embeddings: List of 3 enrollment embeddings (stored individually)
         environment: Environment name (for threshold selection)
         uid: User ID (for logging similarity distributions)
+        enrollment_normalized: True if the enrollment embeddings are stored as
+            unit vectors (profile flag embeddingsNormalized); cosine similarity
+            then reduces to a dot product with the normalized session embedding
+        enrollment_quantized: True if enrollment_embeddings is the (N, D) int8
+            matrix decoded from enrollmentEmbeddingsI8; the session embedding
+            is quantized the same way and compared with int8 kernels
         
     Returns:
         Tuple of (VerificationDecision, warning_message)
         warning_message is None if no compatibility issues
     """
-    if not enrollment_embeddings or len(enrollment_embeddings) == 0:
+    if enrollment_embeddings is None or len(enrollment_embeddings) == 0:
         raise ValueError("No enrollment embeddings provided")
     
-    # Compute similarities to all enrollment embeddings
-    similarities = []
-    for emb in enrollment_embeddings:
+    # Compute similarities to all enrollment embeddings as one (N,) array
+    if enrollment_quantized:
+        session_vec = np.asarray(session_embedding, dtype=np.float32)
+        session_norm = np.sqrt(np.vdot(session_vec, session_vec))
+        if session_norm == 0:
+            similarities = np.zeros(len(enrollment_embeddings), dtype=np.float32)
+        else:
+            session_i8 = quantize_unit_rows((session_vec / session_norm)[None, :])
+            similarities = cosine_similarity_matrix_i8(session_i8, enrollment_embeddings)[0]
+    elif enrollment_normalized:
+        # Unit-length enrollments: normalize the session embedding once and
+        # compute all dot products in one C-contiguous float32 gemv
+        enrollment_matrix = np.ascontiguousarray(enrollment_embeddings, dtype=np.float32)
+        session_vec = np.asarray(session_embedding, dtype=np.float32)
+        if enrollment_matrix.ndim != 2 or enrollment_matrix.shape[1] != session_vec.shape[0]:
+            raise ValueError(
+                f"Embedding dimensions must match: {session_vec.shape[0]} vs {enrollment_matrix.shape[-1]}"
+            )
+        session_norm = np.sqrt(np.vdot(session_vec, session_vec))
+        if session_norm == 0:
+            similarities = np.zeros(len(enrollment_matrix), dtype=np.float32)
+        else:
+            similarities = enrollment_matrix @ (session_vec / session_norm)
+    else:
+        # Raw enrollments: one batched cosine kernel call for all of them
         try:
-            sim = cosine_similarity(session_embedding, emb)
-            similarities.append(sim)
+            similarities = cosine_similarity_matrix(
+                np.asarray(session_embedding, dtype=np.float32)[None, :],
+                np.asarray(enrollment_embeddings, dtype=np.float32),
+            )[0]
         except Exception as e:
-            print(f"[VERIFICATION] Error computing similarity: {e}")
+            logger.error("[VERIFICATION] Error computing similarity: %s", e)
             raise
     
-    if not similarities:
+    if similarities.size == 0:
         raise ValueError("No similarities computed")
     
     # Calculate metrics
-    max_similarity = max(similarities)
+    max_similarity = float(similarities.max())
     
-    # Top-K mean (K=2): mean of top 2 similarities
-    sorted_similarities = sorted(similarities, reverse=True)
-    top_k = min(2, len(sorted_similarities))
-    top_k_mean = np.mean(sorted_similarities[:top_k])
+    # Top-K mean (K=2): mean of top 2 similarities (partial sort, no full sort)
+    top_k = min(2, similarities.size)
+    top_k_mean = float(np.partition(similarities, -top_k)[-top_k:].mean())
     
-    # Clamp similarity scores to be >= 0 (Pydantic validation requirement)
-    # Cosine similarity can theoretically be negative, but we clamp to 0 for consistency
-    max_similarity = max(0.0, max_similarity)
-    top_k_mean = max(0.0, top_k_mean)
+    # Clamp similarity scores to [0, 1] (the VerificationDecision field bounds)
+    # Cosine similarity can theoretically be negative, and float32 rounding can
+    # put it a hair above 1, so clamp for consistency
+    max_similarity = min(1.0, max(0.0, max_similarity))
+    top_k_mean = min(1.0, max(0.0, top_k_mean))
     
     # Get thresholds
     threshold_config = get_threshold_config(environment)
@@ -132,15 +165,16 @@ def verify_speaker(
         try:
             log_similarity_score(uid, max_similarity, internal_state, environment)
         except Exception as e:
-            print(f"[VERIFICATION] Error logging similarity: {e}")
+            logger.error("[VERIFICATION] Error logging similarity: %s", e)
     
-    # Create decision (user-facing is binary, internal state preserved)
-    decision = VerificationDecision(
+    # Create decision (user-facing is binary, internal state preserved).
+    # Every field is built above with its final type and range, so skip validation
+    decision = VerificationDecision.model_construct(
         decision=user_decision,  # User-facing: OWNER or OTHER
         internalState=internal_state,  # Internal: OWNER, UNCERTAIN, OTHER, or SKIPPED
         maxSimilarity=float(max_similarity),
         topKMean=float(top_k_mean),
-        allSimilarities=[float(s) for s in similarities],
+        allSimilarities=similarities.tolist(),
         thresholdUsed={
             "ownerThreshold": threshold_config.ownerThreshold,
             "uncertainThreshold": threshold_config.uncertainThreshold
@@ -150,6 +184,109 @@ def verify_speaker(
     return decision, None
 
 
+# dtype tag stored with packed embedding matrices -> numpy dtype
+_PACKED_DTYPES = {'f32': np.float32, 'i8': np.int8}
+
+
+def _pack_matrix(matrix: np.ndarray, dtype_tag: str) -> dict:
+    """Pack an (N, D) matrix as raw bytes (Firestore stores bytes natively)."""
+    matrix = np.ascontiguousarray(matrix, dtype=_PACKED_DTYPES[dtype_tag])
+    return {
+        'data': matrix.tobytes(),
+        'count': int(matrix.shape[0]),
+        'dim': int(matrix.shape[1]),
+        'dtype': dtype_tag,
+    }
+
+
+def _unpack_matrix(packed: Optional[dict], dtype_tag: str) -> Optional[np.ndarray]:
+    """Unpack a matrix written by _pack_matrix; None if missing or malformed."""
+    if not isinstance(packed, dict) or packed.get('dtype') != dtype_tag:
+        return None
+    try:
+        matrix = np.frombuffer(packed['data'], dtype=_PACKED_DTYPES[dtype_tag])
+        return matrix.reshape(int(packed['count']), int(packed['dim']))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def encode_embeddings(unit_matrix: np.ndarray) -> dict:
+    """Pack enrollment embeddings as float32 bytes for Firestore.
+
+    Args:
+        unit_matrix: (N, D) matrix of enrollment embeddings
+
+    Returns:
+        dict stored as enrollmentEmbeddingsF32 ({data, count, dim, dtype})
+    """
+    return _pack_matrix(unit_matrix, 'f32')
+
+
+def encode_quantized_embeddings(unit_matrix: np.ndarray) -> dict:
+    """Pack L2-normalized enrollment embeddings as int8 bytes for Firestore.
+
+    Args:
+        unit_matrix: (N, D) matrix of unit-length embeddings
+
+    Returns:
+        dict stored as enrollmentEmbeddingsI8 ({data, count, dim, dtype})
+    """
+    return _pack_matrix(quantize_unit_rows(unit_matrix), 'i8')
+
+
+def decode_quantized_embeddings(packed: Optional[dict]) -> Optional[np.ndarray]:
+    """Unpack enrollmentEmbeddingsI8 into an (N, D) int8 matrix.
+
+    Returns None if the value is missing or malformed so callers can fall
+    back to the float embeddings.
+    """
+    return _unpack_matrix(packed, 'i8')
+
+
+def load_enrollment_embeddings(profile_data: dict) -> Optional[np.ndarray]:
+    """Load a voice profile's enrollment embeddings as one (N, D) float32 matrix.
+
+    Formats, newest first:
+    1. enrollmentEmbeddingsF32: packed float32 bytes
+    2. enrollmentEmbeddings: map of index -> list of floats (or a list of lists)
+    3. voiceEmbedding: legacy single averaged embedding
+
+    Args:
+        profile_data: voice_profiles document data
+
+    Returns:
+        (N, D) float32 matrix, or None if the profile has no embeddings
+
+    Raises:
+        ValueError: If a stored embedding has an unexpected format
+    """
+    matrix = _unpack_matrix(profile_data.get('enrollmentEmbeddingsF32'), 'f32')
+    if matrix is not None:
+        return matrix
+    
+    embeddings_raw = profile_data.get('enrollmentEmbeddings')
+    if isinstance(embeddings_raw, dict):
+        # Firestore map: sort by numeric index to keep enrollment order
+        sorted_keys = sorted(embeddings_raw.keys(), key=lambda x: int(x) if x.isdigit() else 0)
+        embeddings = []
+        for k in sorted_keys:
+            emb_value = embeddings_raw[k]
+            if isinstance(emb_value, str) or not hasattr(emb_value, '__iter__'):
+                raise ValueError(f"Invalid embedding format at key '{k}': expected list, got {type(emb_value)}")
+            embeddings.append(emb_value)
+    else:
+        embeddings = embeddings_raw
+    
+    if not embeddings:
+        # Fallback to legacy single embedding
+        stored_embedding = profile_data.get('voiceEmbedding')
+        if not stored_embedding:
+            return None
+        embeddings = [stored_embedding]
+    
+    return np.asarray(embeddings, dtype=np.float32)
+
+
 def verify_session_audio(
     audio_path: str,
     enrollment_embeddings: List[List[float]],
@@ -229,7 +366,7 @@ def verify_session_audio(
             error_reason = "network_error"
             retryable = True
         
-        print(f"[VERIFICATION] Verification failed (fail-closed): {error_reason}")
+        logger.warning("[VERIFICATION] Verification failed (fail-closed): %s", error_reason)
         
         return VerificationResult(
             status="SKIPPED",
@@ -270,7 +407,7 @@ def verify_session_audio(
         
     except Exception as e:
         # V1: Don't block on logic errors - log and treat as OWNER
-        print(f"[VERIFICATION] Verification logic error (v1: logging only): {e}")
+        logger.error("[VERIFICATION] Verification logic error (v1: logging only): %s", e)
         return VerificationResult(
             status="ERROR",
             internalStatus="ERROR",
@@ -312,8 +449,8 @@ def verify_chunk_audio(
         chunk_embedding = extract_speaker_embedding(chunk_path)
     except Exception as e:
         # V1: Don't block chunk - log error, treat as OWNER to avoid blocking
-        print(f"[VERIFICATION] Chunk {chunk_index} verification failed (v1: logging only): {e}")
-        decision = VerificationDecision(
+        logger.error("[VERIFICATION] Chunk %s verification failed (v1: logging only): %s", chunk_index, e)
+        decision = VerificationDecision.model_construct(
             decision="OWNER",  # V1: Map errors to OWNER
             internalState="SKIPPED",  # Internal state for logging
             maxSimilarity=0.0,
@@ -321,7 +458,7 @@ def verify_chunk_audio(
             allSimilarities=[],
             thresholdUsed={}
         )
-        return ChunkVerification(
+        return ChunkVerification.model_construct(
             startTime=chunk_start_time,
             endTime=chunk_end_time,
             decision=decision,
@@ -336,7 +473,7 @@ def verify_chunk_audio(
         uid
     )
     
-    return ChunkVerification(
+    return ChunkVerification.model_construct(
         startTime=chunk_start_time,
         endTime=chunk_end_time,
         decision=decision,
@@ -5,6 +5,8 @@ echo Make sure you're in the backend directory and have activated the virtual en
 echo.
 cd /d %~dp0
 call venv\Scripts\activate.bat
+rem Local runs are dev (enables the /debug endpoints) unless ENV is already set
+if not defined ENV set ENV=dev
 python -m uvicorn app.main:app --reload --host 0.0.0.0 --port 8001
 pause
 